@@ -0,0 +1,108 @@
+"""
+Пакетные операции BaseDAO против построчного цикла на PostgreSQL.
+Каждый сценарий выполняется в транзакции, которая откатывается.
+
+Запуск: python -m benchmarks.bulk_dao --rows 5000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from src.auth.dao import RefreshTokenDAO
+from src.business.models import BusinessProfileModel  # noqa: F401 - нужен для настройки маппера UserModel
+from src.core.config import settings
+from src.database.session import async_session_maker, engine
+from src.users.dao import UserDAO
+
+
+def make_users(rows: int) -> list[dict]:
+    return [
+        {
+            "id": uuid.uuid4(),
+            "email": f"bulk-{uuid.uuid4().hex}@gmail.com",
+            "hashed_password": "hash",
+            "role": "user",
+            "first_name": "Ivan",
+            "last_name": "Ivanov",
+            "phone": "+79999999999",
+        }
+        for _ in range(rows)
+    ]
+
+
+def make_tokens(user_id: uuid.UUID, rows: int) -> list[dict]:
+    expires_at = datetime.now(timezone.utc) + timedelta(days=30)
+    return [
+        {"jti": uuid.uuid4(), "token_hash": uuid.uuid4().bytes * 2, "expires_at": expires_at, "user_id": user_id}
+        for _ in range(rows)
+    ]
+
+
+async def run(name: str, scenario, rows: int) -> None:
+    async with async_session_maker() as session:
+        try:
+            started = time.perf_counter()
+            await scenario(session, rows)
+            elapsed = time.perf_counter() - started
+        finally:
+            await session.rollback()
+    print(f"{name:40}{elapsed * 1000:>12.1f} ms{rows / elapsed:>14.0f} rows/s")
+
+
+async def insert_loop(session, rows):
+    for user in make_users(rows):
+        await UserDAO.add(session=session, obj_in=user)
+
+
+async def insert_executemany(session, rows):
+    await UserDAO.add_many(session, make_users(rows))
+
+
+async def insert_copy(session, rows):
+    await UserDAO._copy_many(session, make_users(rows))
+
+
+async def upsert_executemany(session, rows):
+    users = make_users(rows)
+    await UserDAO.add_many(session, users)
+    await UserDAO.upsert_many(session, [{**user, "first_name": "Oleg"} for user in users], conflict_columns=("id",))
+
+
+async def revoke_loop(session, rows):
+    user = make_users(1)[0]
+    await UserDAO.add(session=session, obj_in=user)
+    tokens = make_tokens(user["id"], rows)
+    await RefreshTokenDAO.add_many(session, tokens)
+    started = time.perf_counter()
+    for token in tokens:
+        await RefreshTokenDAO.delete(session=session, jti=token["jti"])
+    print(f"  (per-row delete only: {(time.perf_counter() - started) * 1000:.1f} ms)")
+
+
+async def revoke_set_based(session, rows):
+    user = make_users(1)[0]
+    await UserDAO.add(session=session, obj_in=user)
+    await RefreshTokenDAO.add_many(session, make_tokens(user["id"], rows))
+    started = time.perf_counter()
+    await RefreshTokenDAO.delete_many(session, user_id=user["id"])
+    print(f"  (delete_many only: {(time.perf_counter() - started) * 1000:.1f} ms)")
+
+
+async def main(rows: int) -> None:
+    print(f"{rows} rows, chunk size {settings.db.BULK_CHUNK_SIZE}")
+    await run("insert: per-row add", insert_loop, rows)
+    await run("insert: add_many (executemany)", insert_executemany, rows)
+    await run("insert: COPY", insert_copy, rows)
+    await run("add_many + upsert_many", upsert_executemany, rows)
+    await run("revoke user tokens: per-row delete", revoke_loop, rows)
+    await run("revoke user tokens: delete_many", revoke_set_based, rows)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows))
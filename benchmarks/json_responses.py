@@ -0,0 +1,114 @@
+"""
+Сериализация ответов с UserOut и BusinessProfileOut: JSONResponse из Starlette против ORJSONResponse.
+
+Первая часть меряет только сериализацию dict из model_dump(): для json это jsonable_encoder + json.dumps,
+как FastAPI делает для ответов без response_model, orjson принимает UUID и datetime как есть.
+Вторая - запрос целиком через FastAPI (response_model + сериализация) без сети, через ASGITransport.
+
+Запуск: python -m benchmarks.json_responses --iterations 2000 --items 50
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from httpx import ASGITransport, AsyncClient
+
+from src.business.schemas import BusinessProfileOut
+from src.core.responses import ORJSONResponse
+from src.users.schemas import UserOut
+
+RESPONSE_CLASSES = [("json", JSONResponse), ("orjson", ORJSONResponse)]
+
+
+def make_user() -> UserOut:
+    now = datetime.now(timezone.utc)
+    return UserOut(
+        id=uuid.uuid4(),
+        email=f"user-{uuid.uuid4().hex[:8]}@gmail.com",
+        first_name="Ivan",
+        last_name="Ivanov",
+        phone="+79999999999",
+        role="user",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def make_business_profile() -> BusinessProfileOut:
+    now = datetime.now(timezone.utc)
+    return BusinessProfileOut(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        business_name="Ivanov & Co",
+        description="Бизнес профиль для замера сериализации",
+        address="Москва, ул. Тверская, 1",
+        working_hours=[{"day": day, "from_time": "09:00", "to_time": "18:00"} for day in ("mon", "tue", "wed")],
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def measure_render(name: str, payload, iterations: int) -> None:
+    rates = {}
+    for renderer, response_class in RESPONSE_CLASSES:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            response_class(jsonable_encoder(payload) if response_class is JSONResponse else payload)
+        rates[renderer] = iterations / (time.perf_counter() - started)
+    print(f"  {name:32}{rates['json']:>10.0f} -> {rates['orjson']:>8.0f} responses/s")
+
+
+def build_app(response_class, users: List[UserOut], profiles: List[BusinessProfileOut]) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/user", response_model=UserOut)
+    async def get_user():
+        return users[0]
+
+    @app.get("/users", response_model=List[UserOut])
+    async def get_users():
+        return users
+
+    @app.get("/business-profiles", response_model=List[BusinessProfileOut])
+    async def get_business_profiles():
+        return profiles
+
+    return app
+
+
+async def measure_requests(users, profiles, iterations: int) -> None:
+    for path in ("/user", "/users", "/business-profiles"):
+        rates = {}
+        for renderer, response_class in RESPONSE_CLASSES:
+            app = build_app(response_class, users, profiles)
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+                for _ in range(50):
+                    await client.get(path)
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    await client.get(path)
+                rates[renderer] = iterations / (time.perf_counter() - started)
+        print(f"  GET {path:28}{rates['json']:>10.0f} -> {rates['orjson']:>8.0f} requests/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=50)
+    args = parser.parse_args()
+
+    users = [make_user() for _ in range(args.items)]
+    profiles = [make_business_profile() for _ in range(args.items)]
+
+    print("render, json -> orjson:")
+    measure_render("UserOut", users[0].model_dump(), args.iterations * 10)
+    measure_render(f"{args.items} x UserOut", [u.model_dump() for u in users], args.iterations)
+    measure_render(f"{args.items} x BusinessProfileOut", [p.model_dump() for p in profiles], args.iterations)
+    print("full request, json -> orjson:")
+    asyncio.run(measure_requests(users, profiles, args.iterations // 4))
@@ -0,0 +1,86 @@
+"""
+Горячие чтения пользователя: ORM объект + model_validate против проекции колонок.
+Запросы идут в PostgreSQL, кэш сущностей выключен, чтобы сравнивать именно чтение из БД;
+как и в обработчике запроса, каждое чтение выполняется в новой сессии.
+
+Запуск: python -m benchmarks.projection_reads --iterations 2000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from src.business.models import BusinessProfileModel  # noqa: F401 - нужен для настройки маппера UserModel
+from src.core.config import settings
+from src.database.session import async_session_maker, engine
+from src.users.dao import UserDAO
+from src.users.schemas import UserCredentials, UserInDB, UserOut
+
+
+async def login_orm(session, user):
+    return UserInDB.model_validate(await UserDAO.find_one_or_none(session=session, email=user["email"]))
+
+
+async def login_projection(session, user):
+    return await UserDAO.find_one_projection(session, schema=UserCredentials, email=user["email"])
+
+
+async def me_orm(session, user):
+    return UserOut.model_validate(await UserDAO.find_one_or_none(session=session, id=user["id"]))
+
+
+async def me_projection(session, user):
+    return await UserDAO.find_one_projection(session, schema=UserOut, id=user["id"])
+
+
+async def read_in_new_session(read, user):
+    async with async_session_maker() as session:
+        return await read(session, user)
+
+
+async def measure(name: str, read, user, iterations: int) -> None:
+    for _ in range(50):
+        await read_in_new_session(read, user)
+
+    started, cpu_started = time.perf_counter(), time.process_time()
+    for _ in range(iterations):
+        await read_in_new_session(read, user)
+    elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+
+    print(f"{name:28}{elapsed / iterations * 1e6:>10.0f} us/read{cpu / iterations * 1e6:>10.0f} us CPU/read"
+          f"{iterations / elapsed:>10.0f} reads/s")
+
+
+async def main(iterations: int) -> None:
+    settings.db.ENTITY_CACHE_ENABLED = False
+    user = {
+        "id": uuid.uuid4(),
+        "email": f"projection-{uuid.uuid4().hex}@gmail.com",
+        "hashed_password": "$2b$12$" + "x" * 53,
+        "role": "user",
+        "first_name": "Ivan",
+        "last_name": "Ivanov",
+        "phone": "+79999999999",
+    }
+    async with async_session_maker() as session:
+        await UserDAO.add(session=session, obj_in=user)
+        await session.commit()
+        try:
+            for name, read in [
+                ("login: ORM + model_validate", login_orm),
+                ("login: projection", login_projection),
+                ("/me: ORM + model_validate", me_orm),
+                ("/me: projection", me_projection),
+            ]:
+                await measure(name, read, user, iterations)
+        finally:
+            await UserDAO.delete(session=session, id=user["id"])
+            await session.commit()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
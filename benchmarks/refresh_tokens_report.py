@@ -0,0 +1,142 @@
+"""
+Сравнение старой (текст токена, без индексов) и новой (sha256, индексы по user_id и expires_at)
+схемы refresh_tokens на заполненной таблице PostgreSQL.
+
+Запуск: python -m benchmarks.refresh_tokens_report --rows 200000
+Таблицы создаются во временной схеме и удаляются после отчета.
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.config import settings
+
+SCHEMA = "bench_refresh_tokens"
+
+LAYOUTS = {
+    "text token, no indexes": """
+        CREATE TABLE {schema}.refresh_tokens_old (
+            jti uuid PRIMARY KEY,
+            token text NOT NULL,
+            expires_at timestamptz NOT NULL,
+            user_id uuid NOT NULL REFERENCES {schema}.users_old(id) ON DELETE CASCADE,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            updated_at timestamptz NOT NULL DEFAULT now()
+        )
+    """,
+    "sha256 digest, indexed": """
+        CREATE TABLE {schema}.refresh_tokens_new (
+            jti uuid PRIMARY KEY,
+            token_hash bytea NOT NULL,
+            expires_at timestamptz NOT NULL,
+            user_id uuid NOT NULL REFERENCES {schema}.users_new(id) ON DELETE CASCADE,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            updated_at timestamptz NOT NULL DEFAULT now()
+        );
+        CREATE INDEX ON {schema}.refresh_tokens_new (expires_at);
+        CREATE INDEX ON {schema}.refresh_tokens_new (user_id)
+    """,
+}
+
+# Подписанный RS256 refresh токен занимает ~550 символов
+TOKEN_SQL = "repeat(md5(i::text), 17)"
+
+
+async def timed(conn, statement: str, repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await conn.execute(text(statement))
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+async def report_layout(conn, suffix: str, rows: int, users: int) -> dict:
+    table = f"{SCHEMA}.refresh_tokens_{suffix}"
+    users_table = f"{SCHEMA}.users_{suffix}"
+    token_column = "token" if suffix == "old" else "token_hash"
+    token_value = TOKEN_SQL if suffix == "old" else f"sha256(convert_to({TOKEN_SQL}, 'UTF8'))"
+
+    started = time.perf_counter()
+    await conn.execute(text(
+        f"INSERT INTO {users_table} (id) SELECT md5('user' || i)::uuid FROM generate_series(1, {users}) i"
+    ))
+    await conn.execute(text(f"""
+        INSERT INTO {table} (jti, {token_column}, expires_at, user_id)
+        SELECT gen_random_uuid(), {token_value},
+               now() + ((i % 40) - 10) * interval '1 day',
+               md5('user' || (i % {users} + 1))::uuid
+        FROM generate_series(1, {rows}) i
+    """))
+    await conn.commit()
+    seed_ms = (time.perf_counter() - started) * 1000
+    await conn.execute(text(f"ANALYZE {table}"))
+
+    sizes = (await conn.execute(text(
+        f"SELECT pg_relation_size('{table}'), pg_indexes_size('{table}'), pg_total_relation_size('{table}')"
+    ))).one()
+
+    # Изменяющие запросы выполняются и откатываются, чтобы замеры были на одинаковых данных
+    cascade_ms = await timed(conn, f"DELETE FROM {users_table} WHERE id = md5('user1')::uuid")
+    await conn.rollback()
+    by_user_ms = await timed(
+        conn, f"SELECT count(*) FROM {table} WHERE user_id = md5('user2')::uuid", repeat=20
+    )
+    expired_ms = await timed(conn, f"DELETE FROM {table} WHERE expires_at < now()")
+    await conn.rollback()
+    batch_ms = await timed(conn, f"""
+        DELETE FROM {table} WHERE jti IN (
+            SELECT jti FROM {table} WHERE expires_at < now() LIMIT 1000
+        )
+    """)
+    await conn.rollback()
+
+    return {
+        "seed, ms": seed_ms,
+        "heap, MB": sizes[0] / 2 ** 20,
+        "indexes, MB": sizes[1] / 2 ** 20,
+        "total, MB": sizes[2] / 2 ** 20,
+        "cascade delete of one user, ms": cascade_ms,
+        "tokens of one user, ms": by_user_ms,
+        "delete all expired, ms": expired_ms,
+        "delete 1000 expired, ms": batch_ms,
+    }
+
+
+async def main(rows: int, users: int) -> None:
+    engine = create_async_engine(settings.db.database_url)
+    async with engine.connect() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        for suffix in ("old", "new"):
+            await conn.execute(text(f"CREATE TABLE {SCHEMA}.users_{suffix} (id uuid PRIMARY KEY)"))
+        for ddl in LAYOUTS.values():
+            for statement in ddl.format(schema=SCHEMA).split(";"):
+                await conn.execute(text(statement))
+        await conn.commit()
+
+        try:
+            results = {
+                name: await report_layout(conn, suffix, rows, users)
+                for name, suffix in zip(LAYOUTS, ("old", "new"))
+            }
+        finally:
+            await conn.rollback()
+            await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            await conn.commit()
+    await engine.dispose()
+
+    names = list(results)
+    print(f"refresh_tokens: {rows} rows, {users} users")
+    print(f"{'':34}" + "".join(f"{name:>26}" for name in names))
+    for metric in results[names[0]]:
+        print(f"{metric:34}" + "".join(f"{results[name][metric]:>26.2f}" for name in names))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.users))
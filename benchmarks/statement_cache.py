@@ -0,0 +1,73 @@
+"""
+Накладные расходы на построение запросов в find_one_or_none: генеративный select(...).filter_by(...)
+на каждый вызов против заранее собранного запроса с bindparam.
+
+Первая часть меряет только построение выражения и его cache key (без БД),
+вторая - find_one_or_none целиком на SQLite в памяти, чтобы сетевая задержка не скрывала CPU.
+
+Запуск: python -m benchmarks.statement_cache --iterations 20000
+"""
+import argparse
+import asyncio
+import time
+import timeit
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.auth.dao import RefreshTokenDAO
+from src.business.models import BusinessProfileModel  # noqa: F401 - нужен для настройки маппера UserModel
+from src.core.config import settings
+from src.database.session import Base
+from src.users.dao import UserDAO
+
+LOOKUPS = [
+    ("users.id", UserDAO, "id", uuid.uuid4()),
+    ("users.email", UserDAO, "email", "bench@gmail.com"),
+    ("refresh_tokens.jti", RefreshTokenDAO, "jti", uuid.uuid4()),
+]
+
+
+def build_statements(iterations: int) -> None:
+    print("statement + cache key, per call:")
+    for name, dao, column, value in LOOKUPS:
+        timings = {}
+        for enabled in (False, True):
+            settings.db.STATEMENT_CACHE_ENABLED = enabled
+
+            def build():
+                query, _ = dao._lookup_query((), {column: value})
+                query._generate_cache_key()
+
+            timings[enabled] = timeit.timeit(build, number=iterations) / iterations * 1e6
+        print(f"  {name:22}{timings[False]:>10.1f} us -> {timings[True]:>6.1f} us")
+
+
+async def execute_lookups(iterations: int) -> None:
+    settings.db.ENTITY_CACHE_ENABLED = False
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    print("find_one_or_none on in-memory SQLite:")
+    async with session_maker() as session:
+        for name, dao, column, value in LOOKUPS:
+            rates = {}
+            for enabled in (False, True):
+                settings.db.STATEMENT_CACHE_ENABLED = enabled
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    await dao.find_one_or_none(session, **{column: value})
+                rates[enabled] = iterations / (time.perf_counter() - started)
+            print(f"  {name:22}{rates[False]:>10.0f} -> {rates[True]:>6.0f} queries/s")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    build_statements(args.iterations)
+    asyncio.run(execute_lookups(args.iterations // 4))
@@ -0,0 +1,41 @@
+"""store refresh token digests
+
+Revision ID: 4013f56558bd
+Revises: 1e62c63a6ce7
+Create Date: 2026-10-17 18:46:24.254299
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4013f56558bd'
+down_revision: Union[str, Sequence[str], None] = '1e62c63a6ce7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True))
+    op.execute("UPDATE refresh_tokens SET token_hash = sha256(convert_to(token, 'UTF8'))")
+    op.alter_column('refresh_tokens', 'token_hash', nullable=False)
+    op.drop_column('refresh_tokens', 'token')
+    # Модель объявляла jti с primary_key=True и unique=True: лишний UNIQUE дублировал индекс первичного ключа.
+    # CREATE TABLE в PostgreSQL такой дубликат сам отбрасывает, поэтому ограничения может и не быть
+    op.execute("ALTER TABLE refresh_tokens DROP CONSTRAINT IF EXISTS refresh_tokens_jti_key")
+    op.create_index(op.f('ix_refresh_tokens_expires_at'), 'refresh_tokens', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_refresh_tokens_user_id'), 'refresh_tokens', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Текст токенов не восстановить: он нигде не читается, поэтому колонка заполняется пустой строкой
+    op.add_column('refresh_tokens', sa.Column('token', sa.TEXT(), server_default='', nullable=False))
+    op.alter_column('refresh_tokens', 'token', server_default=None)
+    op.drop_index(op.f('ix_refresh_tokens_user_id'), table_name='refresh_tokens')
+    op.drop_index(op.f('ix_refresh_tokens_expires_at'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token_hash')
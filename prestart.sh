@@ -4,6 +4,7 @@
 echo "Let the DB start"
 python ./src/backend_pre_start.py
 
+# База, созданная до появления миграций, сначала отмечается ревизией: alembic stamp 1e62c63a6ce7 (см. README)
 echo "Applying database migrations..."
 alembic upgrade head
 
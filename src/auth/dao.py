@@ -1,6 +1,29 @@
-from src.auth.models import RefreshTokenModel
+import uuid
+from typing import Optional
+
+from sqlalchemy import Row, bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.models import RefreshTokenModel, RevokedTokenModel
 from src.database.base import BaseDAO
+from src.users.models import UserModel
 
 
 class RefreshTokenDAO(BaseDAO):
     model = RefreshTokenModel
+
+    @classmethod
+    async def find_with_owner_role(cls, session: AsyncSession, jti: uuid.UUID) -> Optional[Row]:
+        """Срок действия refresh токена и роль его владельца одним запросом"""
+        query = cls._cached_statement(
+            ("owner_role",),
+            lambda: select(cls.model.jti, cls.model.expires_at, cls.model.user_id, UserModel.role)
+            .join(UserModel, UserModel.id == cls.model.user_id)
+            .where(cls.model.jti == bindparam("jti"))
+        )
+        result = await session.execute(query, {"jti": jti})
+        return result.one_or_none()
+
+
+class RevokedTokenDAO(BaseDAO):
+    model = RevokedTokenModel
@@ -0,0 +1,195 @@
+import binascii
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from jwt.algorithms import get_default_algorithms
+from jwt.utils import base64url_decode, base64url_encode
+from loguru import logger
+
+from src.auth.schemas import TokenFields
+from src.core.config import AuthSettings, settings
+
+
+def _json_segment(data: dict) -> bytes:
+    return base64url_encode(json.dumps(data, separators=(",", ":")).encode())
+
+
+def _header_segment(algorithm: str) -> bytes:
+    # PyJWT сортирует поля заголовка, поэтому сегмент совпадает с тем, что выдает jwt.encode
+    return base64url_encode(
+        json.dumps({"alg": algorithm, "typ": "JWT"}, separators=(",", ":"), sort_keys=True).encode()
+    )
+
+
+def _load_json_segment(segment: bytes) -> Any:
+    try:
+        return json.loads(base64url_decode(segment))
+    except (binascii.Error, ValueError) as e:
+        raise jwt.DecodeError(f"Invalid token segment: {e}") from e
+
+
+class JWTSigner:
+    """Подпись токенов заранее разобранным ключом с предвычисленным заголовком"""
+
+    def __init__(self, algorithm: str, private_key: Any):
+        self.algorithm = algorithm
+        self.source_key = private_key
+        self._algorithm = get_default_algorithms()[algorithm]
+        self._key = self._algorithm.prepare_key(private_key)
+        self.header_segment = _header_segment(algorithm)
+
+    def encode(self, payload: dict) -> str:
+        signing_input = self.header_segment + b"." + _json_segment(payload)
+        signature = self._algorithm.sign(signing_input, self._key)
+        return (signing_input + b"." + base64url_encode(signature)).decode("ascii")
+
+
+class JWTVerifier:
+    """Проверка подписи и только тех claims, которые использует приложение"""
+
+    REQUIRED_CLAIMS = (
+        TokenFields.TOKEN_TYPE_FIELD.value,
+        TokenFields.TOKEN_SUB_FIELD.value,
+        TokenFields.TOKEN_EXPIRE_FIELD.value,
+    )
+    STRING_CLAIMS = (
+        TokenFields.TOKEN_TYPE_FIELD.value,
+        TokenFields.TOKEN_SUB_FIELD.value,
+        TokenFields.TOKEN_JTI_FIELD.value,
+        TokenFields.TOKEN_ROLE_FIELD.value,
+    )
+
+    def __init__(self, algorithm: str, public_key: Any):
+        self.algorithm = algorithm
+        self.source_key = public_key
+        self._algorithm = get_default_algorithms()[algorithm]
+        self._key = self._algorithm.prepare_key(public_key)
+        self._header_segment = _header_segment(algorithm)
+
+    def decode(self, token: str | bytes) -> dict:
+        if isinstance(token, str):
+            token = token.encode("utf-8")
+        try:
+            signing_input, crypto_segment = token.rsplit(b".", 1)
+            header_segment, payload_segment = signing_input.split(b".", 1)
+        except ValueError:
+            raise jwt.DecodeError("Not enough segments")
+
+        if header_segment != self._header_segment:
+            header = _load_json_segment(header_segment)
+            if not isinstance(header, dict) or header.get("alg") != self.algorithm:
+                raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+
+        try:
+            signature = base64url_decode(crypto_segment)
+        except binascii.Error as e:
+            raise jwt.DecodeError("Invalid crypto padding") from e
+        if not self._algorithm.verify(signing_input, self._key, signature):
+            raise jwt.InvalidSignatureError("Signature verification failed")
+
+        payload = _load_json_segment(payload_segment)
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload string: must be a json object")
+        self._validate_claims(payload)
+        return payload
+
+    def _validate_claims(self, payload: dict) -> None:
+        for claim in self.REQUIRED_CLAIMS:
+            if claim not in payload:
+                raise jwt.MissingRequiredClaimError(claim)
+        for claim in self.STRING_CLAIMS:
+            if claim in payload and not isinstance(payload[claim], str):
+                raise jwt.InvalidTokenError(f"Claim ({claim}) must be a string")
+
+        exp = payload[TokenFields.TOKEN_EXPIRE_FIELD.value]
+        if not isinstance(exp, int) or isinstance(exp, bool):
+            raise jwt.DecodeError("Expiration Time claim (exp) must be an integer.")
+        if exp <= datetime.now(timezone.utc).timestamp():
+            raise jwt.ExpiredSignatureError("Signature has expired")
+
+
+class _KeyFile:
+    """PEM файл, разобранный в объект ключа; перечитывается при изменении mtime"""
+
+    def __init__(self, path: Path, loader: Callable[[bytes], Any], check_interval: float):
+        self.path = path
+        self._loader = loader
+        self._check_interval = check_interval
+        self._key: Any = None
+        self._mtime_ns: int | None = None
+        self._checked_at: float = 0.0
+
+    def get(self) -> Any:
+        now = time.monotonic()
+        if self._key is not None and now - self._checked_at < self._check_interval:
+            return self._key
+        self._checked_at = now
+
+        mtime_ns = self.path.stat().st_mtime_ns
+        if self._key is not None and mtime_ns == self._mtime_ns:
+            return self._key
+
+        self._key = self._loader(self.path.read_bytes())
+        self._mtime_ns = mtime_ns
+        logger.info("Loaded JWT key from {}", self.path)
+        return self._key
+
+
+class KeyManager:
+    """Ключи JWT, разобранные один раз, и переиспользуемые signer/verifier"""
+
+    def __init__(
+            self,
+            private_key_path: Path,
+            public_key_path: Path,
+            algorithm: str,
+            reload_check_seconds: float = 5.0,
+    ):
+        self.algorithm = algorithm
+        self._private = _KeyFile(
+            private_key_path,
+            lambda data: serialization.load_pem_private_key(data, password=None),
+            reload_check_seconds,
+        )
+        self._public = _KeyFile(public_key_path, serialization.load_pem_public_key, reload_check_seconds)
+        self._signer: JWTSigner | None = None
+        self._verifier: JWTVerifier | None = None
+
+    @classmethod
+    def from_settings(cls, auth_settings: AuthSettings) -> "KeyManager":
+        return cls(
+            private_key_path=auth_settings.PRIVATE_KEY_PATH,
+            public_key_path=auth_settings.PUBLIC_KEY_PATH,
+            algorithm=auth_settings.ALGORITHM,
+            reload_check_seconds=auth_settings.KEYS_RELOAD_CHECK_SECONDS,
+        )
+
+    @property
+    def private_key(self) -> Any:
+        return self._private.get()
+
+    @property
+    def public_key(self) -> Any:
+        return self._public.get()
+
+    @property
+    def signer(self) -> JWTSigner:
+        key = self._private.get()
+        if self._signer is None or self._signer.source_key is not key:
+            self._signer = JWTSigner(self.algorithm, key)
+        return self._signer
+
+    @property
+    def verifier(self) -> JWTVerifier:
+        key = self._public.get()
+        if self._verifier is None or self._verifier.source_key is not key:
+            self._verifier = JWTVerifier(self.algorithm, key)
+        return self._verifier
+
+
+key_manager = KeyManager.from_settings(settings.auth)
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Text
+from sqlalchemy import DateTime, ForeignKey, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import mapped_column, Mapped
 
@@ -11,12 +11,23 @@ from src.database.session import Base
 class RefreshTokenModel(Base):
     __tablename__ = 'refresh_tokens'
 
-    jti: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, unique=True)
+    jti: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
 
-    token: Mapped[str] = mapped_column(Text, nullable=False)
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # SHA-256 от текста токена: сам токен после выдачи нигде не читается
+    token_hash: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
+    # Индексы под очистку просроченных токенов и каскадное удаление из users
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     user_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        unique=False
+        unique=False,
+        index=True
     )
+
+
+class RevokedTokenModel(Base):
+    """Отозванные refresh токены (jti) до истечения их срока - для проверки отзыва в памяти"""
+    __tablename__ = 'revoked_tokens'
+
+    jti: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,113 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.models import RevokedTokenModel
+from src.cache.invalidation import InvalidationBus, invalidation_bus
+from src.core.config import settings
+
+
+class RevocationList:
+    """
+    Отозванные refresh токены в памяти: jti -> exp.
+    Точное множество, а не фильтр Блума: отозванных и еще не истекших токенов немного
+    (не больше числа логаутов за REFRESH_TOKEN_EXPIRE_DAYS), а ложных срабатываний быть не должно.
+    """
+
+    NAMESPACE = "revoked_jti"
+    PRUNE_INTERVAL_SECONDS = 60.0
+
+    def __init__(self, bus: Optional[InvalidationBus] = None):
+        self.bus = bus
+        self.loaded = False
+        self._revoked: Dict[str, float] = {}
+        self._pruned_at = time.monotonic()
+        self._synced_at: Optional[datetime] = None
+        if bus is not None:
+            bus.register(self.NAMESPACE, self._on_remote_revocation)
+
+    @staticmethod
+    def _normalize(jti: str | uuid.UUID) -> str:
+        return str(uuid.UUID(str(jti)))
+
+    def is_revoked(self, jti: str | uuid.UUID) -> bool:
+        self._maybe_prune()
+        expires_at = self._revoked.get(self._normalize(jti))
+        return expires_at is not None and expires_at > time.time()
+
+    def add(self, jti: str | uuid.UUID, expires_at: float) -> None:
+        if expires_at > time.time():
+            self._revoked[self._normalize(jti)] = expires_at
+
+    def revoke(self, jti: str | uuid.UUID, expires_at: float) -> None:
+        """Отозвать локально и сообщить остальным воркерам"""
+        self.add(jti, expires_at)
+        if self.bus is not None:
+            self.bus.publish(self.NAMESPACE, f"{self._normalize(jti)}={expires_at}")
+
+    def prune(self) -> int:
+        now = time.time()
+        expired = [jti for jti, expires_at in self._revoked.items() if expires_at <= now]
+        for jti in expired:
+            del self._revoked[jti]
+        self._pruned_at = time.monotonic()
+        return len(expired)
+
+    def _maybe_prune(self) -> None:
+        if time.monotonic() - self._pruned_at >= self.PRUNE_INTERVAL_SECONDS:
+            self.prune()
+
+    async def load(self, session: AsyncSession) -> int:
+        """
+        Загрузить отозванные и еще не истекшие jti из БД.
+        Повторные вызовы догружают только записи, появившиеся с прошлой загрузки.
+        """
+        now = datetime.now(timezone.utc)
+        query = select(RevokedTokenModel.jti, RevokedTokenModel.expires_at).where(
+            RevokedTokenModel.expires_at > now
+        )
+        if self._synced_at is not None:
+            # Запас на расхождение часов между нодами и долгие транзакции
+            query = query.where(RevokedTokenModel.created_at >= self._synced_at - timedelta(minutes=5))
+
+        result = await session.execute(query)
+        rows = result.all()
+        for jti, expires_at in rows:
+            self.add(jti, expires_at.replace(tzinfo=expires_at.tzinfo or timezone.utc).timestamp())
+        self._synced_at = now
+        self.loaded = True
+        return len(rows)
+
+    async def run_sync(self, session_maker, interval: float) -> None:
+        """Периодическая догрузка из БД на случай потерянных pub/sub сообщений"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with session_maker() as session:
+                    await self.load(session)
+                self.prune()
+            except Exception as e:
+                logger.warning("Cannot sync revoked refresh tokens: {}", e)
+
+    def _on_remote_revocation(self, key: str) -> None:
+        jti, _, expires_at = key.partition("=")
+        try:
+            self.add(jti, float(expires_at))
+        except ValueError:
+            logger.warning("Malformed revocation message: {}", key)
+
+    def stats(self) -> Dict[str, int | bool]:
+        return {"size": len(self._revoked), "loaded": self.loaded}
+
+
+revocation_list = RevocationList(bus=invalidation_bus)
+
+
+def uses_memory_revocation() -> bool:
+    return settings.auth.REFRESH_REVOCATION_MODE == "memory"
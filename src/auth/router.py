@@ -4,7 +4,7 @@ from fastapi import APIRouter, Cookie, HTTPException, status, Response, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.auth.schemas import TokenResponse
+from src.auth.schemas import LogoutResponse, TokenResponse
 from src.auth.service import AuthService
 from src.database.session import get_session
 from src.users.schemas import UserCreate
@@ -40,7 +40,7 @@ async def refresh_access_token(
     return await AuthService.refresh(refresh_token=refresh_token, session=session)
 
 
-@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+@router.post("/logout", response_model=LogoutResponse)
 async def logout_user(
         response: Response,
         refresh_token: Annotated[str, Cookie(...)],
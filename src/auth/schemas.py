@@ -24,6 +24,10 @@ class TokenTypes(str, Enum):
     REFRESH_TOKEN_TYPE = "refresh"
 
 
+class LogoutResponse(BaseModel):
+    revoked: bool
+
+
 class TokensInfo(BaseModel):
     access_token: str = Field(...)
     refresh_token: str = Field(...)
@@ -31,7 +35,7 @@ class TokensInfo(BaseModel):
 
 class RefreshTokenSchema(BaseModel):
     jti: uuid.UUID = Field(...)
-    token: str = Field(...)
+    token_hash: bytes = Field(...)
     expires_at: datetime = Field(...)
     user_id: uuid.UUID = Field(...)
 
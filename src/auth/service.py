@@ -9,11 +9,13 @@ from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth import utils as auth_utils
-from src.auth.dao import RefreshTokenDAO
-from src.auth.schemas import TokenFields, TokenTypes, RefreshTokenSchema, TokenResponse, TokensInfo
+from src.auth.dao import RefreshTokenDAO, RevokedTokenDAO
+from src.auth.revocation import revocation_list, uses_memory_revocation
+from src.auth.schemas import TokenFields, TokenTypes, RefreshTokenSchema, TokenResponse, TokensInfo, LogoutResponse
 from src.core.config import settings
 from src.database.session import async_session_maker
-from src.exceptions.exception_token import CannotAddRefreshToken, CannotFindRefreshToken, CannotDeleteRefreshToken
+from src.exceptions.exception_auth import PasswordHashingUnavailable
+from src.exceptions.exception_token import CannotAddRefreshToken, CannotDeleteRefreshToken
 from src.exceptions.exception_user import UserAlreadyExists, UserNotFound, InvalidPasswordOrUsername
 from src.users.schemas import UserJWTRefreshData, UserJWTAccessData, UserCreate, UserRole
 from src.users.service import UserService
@@ -70,7 +72,7 @@ class TokenService:
         await RefreshTokenService.add_refresh_token(
             RefreshTokenSchema(
                 jti=jti,
-                token=token,
+                token_hash=auth_utils.hash_token(token),
                 expires_at=datetime.now(timezone.utc) + timedelta(days=settings.auth.REFRESH_TOKEN_EXPIRE_DAYS),
                 user_id=uuid.UUID(user.id)
             ),
@@ -96,41 +98,10 @@ class TokenService:
         return TokensInfo(access_token=access_token, refresh_token=refresh_token)
 
     @classmethod
-    async def verify_token(
-            cls,
-            token: str,
-            session: AsyncSession,
-            expected_type: TokenTypes = TokenTypes.ACCESS_TOKEN_TYPE,
-    ) -> Dict[str, Any]:
-        """Проверка и декодирование токена"""
+    def decode_token(cls, token: str, expected_type: TokenTypes = TokenTypes.ACCESS_TOKEN_TYPE) -> Dict[str, Any]:
+        """Проверка подписи, срока действия и типа токена без обращения к БД"""
         try:
             payload = auth_utils.decode_jwt(token)
-
-            if payload.get(TokenFields.TOKEN_TYPE_FIELD.value) != expected_type.value:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail=f"Invalid token type. Expected: {expected_type.value}"
-                )
-
-            # Для refresh токена проверяем, что он не отозван
-            if expected_type == TokenTypes.REFRESH_TOKEN_TYPE:
-                jti = payload.get(TokenFields.TOKEN_JTI_FIELD.value, None)
-                token_record = await RefreshTokenDAO.find_one_or_none(session=session, jti=uuid.UUID(jti))
-                if token_record is None:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Refresh token has been revoked"
-                    )
-                if token_record.expires_at.replace(tzinfo=timezone.utc) < datetime.now(timezone.utc):
-                    await RefreshTokenDAO.delete(session=session, jti=jti)
-                    await session.commit()
-                    raise HTTPException(
-                        status.HTTP_401_UNAUTHORIZED,
-                        detail="Refresh token expired"
-                    )
-
-            return payload
-
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -142,26 +113,88 @@ class TokenService:
                 detail="Invalid token"
             )
 
+        if payload.get(TokenFields.TOKEN_TYPE_FIELD.value) != expected_type.value:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=f"Invalid token type. Expected: {expected_type.value}"
+            )
+        return payload
+
+    @classmethod
+    def check_not_revoked(cls, payload: Dict[str, Any]) -> None:
+        """Проверка refresh токена по списку отозванных в памяти"""
+        jti = payload.get(TokenFields.TOKEN_JTI_FIELD.value, None)
+        if jti is None or revocation_list.is_revoked(jti):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token has been revoked"
+            )
+
+    @classmethod
+    def check_refresh_token_record(cls, token_record) -> None:
+        """Проверка, что запись refresh токена есть в БД и не истекла; истекшие записи удаляет sweeper"""
+        if token_record is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token has been revoked"
+            )
+        if token_record.expires_at.replace(tzinfo=timezone.utc) < datetime.now(timezone.utc):
+            raise HTTPException(
+                status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token expired"
+            )
+
+    @classmethod
+    def get_jti(cls, payload: Dict[str, Any]) -> uuid.UUID:
+        try:
+            return uuid.UUID(payload.get(TokenFields.TOKEN_JTI_FIELD.value))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token"
+            )
+
+    @classmethod
+    async def verify_token(
+            cls,
+            token: str,
+            session: AsyncSession,
+            expected_type: TokenTypes = TokenTypes.ACCESS_TOKEN_TYPE,
+    ) -> Dict[str, Any]:
+        """Проверка и декодирование токена"""
+        payload = cls.decode_token(token, expected_type)
+
+        # Для refresh токена проверяем, что он не отозван
+        if expected_type == TokenTypes.REFRESH_TOKEN_TYPE and uses_memory_revocation():
+            cls.check_not_revoked(payload)
+        elif expected_type == TokenTypes.REFRESH_TOKEN_TYPE:
+            token_record = await RefreshTokenDAO.find_one_or_none(session=session, jti=cls.get_jti(payload))
+            cls.check_refresh_token_record(token_record)
+
+        return payload
+
 
 class AuthService:
     @classmethod
     async def register(cls, user: UserCreate, session: AsyncSession) -> dict | None:
         try:
-            new_user = await UserService.create_user(
+            # Об успешном создании пишет UserService.create_user
+            await UserService.create_user(
                 user=user,
                 session=session
             )
-            logger.info(f"User with ID: {new_user.id} created successfully")
             return {"message": "User created successfully"}
         except UserAlreadyExists:
             msg = "User already exists"
-            logger.error(msg)
+            logger.warning(msg)
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=msg
             )
+        except PasswordHashingUnavailable:
+            raise
         except Exception as e:
-            logger.error(f"Error with register: {e}")
+            logger.error("Error with register: {}", e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Registration failed"
@@ -182,14 +215,14 @@ class AuthService:
             )
         except UserNotFound:
             msg = "User not found"
-            logger.error(msg)
+            logger.warning(msg)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=msg
             )
         except InvalidPasswordOrUsername:
             msg = "Incorrect username or password"
-            logger.error(msg)
+            logger.warning(msg)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=msg,
@@ -215,49 +248,54 @@ class AuthService:
 
     @classmethod
     async def refresh(cls, refresh_token: str, session: AsyncSession) -> TokenResponse:
-        payload = await TokenService.verify_token(
-            token=refresh_token,
-            expected_type=TokenTypes.REFRESH_TOKEN_TYPE,
-            session=session
-        )
-
+        payload = TokenService.decode_token(refresh_token, expected_type=TokenTypes.REFRESH_TOKEN_TYPE)
         user_id = payload.get("sub")
 
-        # берем role из БД тк в payload у refresh токена нету поля role
-        user_db = await UserService.get_user_by_user_id(user_id=uuid.UUID(user_id), session=session)
+        if uses_memory_revocation():
+            TokenService.check_not_revoked(payload)
+            # role берется не из payload (у refresh токена нет поля role), а из кэшируемой проекции id/role
+            principal = await UserService.get_user_principal(user_id=uuid.UUID(user_id), session=session)
+            role = principal.role
+        else:
+            # Запись токена и роль владельца одним запросом
+            token_record = await RefreshTokenDAO.find_with_owner_role(
+                session=session,
+                jti=TokenService.get_jti(payload)
+            )
+            TokenService.check_refresh_token_record(token_record)
+            role = token_record.role if str(token_record.user_id) == user_id else None
 
-        if user_db is None:
+        if role is None:
             msg = "Invalid refresh token payload"
-            logger.error(msg)
+            logger.warning(msg)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=msg
             )
 
-        user_jwt_data = UserJWTAccessData(id=user_id, role=UserRole(user_db.role))
+        user_jwt_data = UserJWTAccessData(id=user_id, role=UserRole(role))
         access_token = await TokenService.create_access_token(user_jwt_data)
 
         return TokenResponse(access_token=access_token)
 
     @classmethod
-    async def logout(cls, refresh_token: str, response: Response, session: AsyncSession):
+    async def logout(cls, refresh_token: str, response: Response, session: AsyncSession) -> LogoutResponse:
         try:
-            payload = await TokenService.verify_token(
-                token=refresh_token,
-                expected_type=TokenTypes.REFRESH_TOKEN_TYPE,
-                session=session
-            )
-            jti = uuid.UUID(payload.get(TokenFields.TOKEN_JTI_FIELD.value))
-            token = await RefreshTokenService.get_refresh_token_by_jti(jti=jti, session=session)
-            if jti and token:
-                await RefreshTokenService.delete_refresh_token(jti=jti, session=session)
-        except (ValueError, jwt.PyJWTError):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token format"
-            )
+            payload = TokenService.decode_token(refresh_token, expected_type=TokenTypes.REFRESH_TOKEN_TYPE)
+            jti = TokenService.get_jti(payload)
+            if uses_memory_revocation() and revocation_list.is_revoked(jti):
+                # Повторный logout - как и в режиме database, без ошибки
+                revoked = False
+            elif uses_memory_revocation():
+                revoked = await RefreshTokenService.revoke_refresh_token(
+                    jti=jti,
+                    expires_at=datetime.fromtimestamp(payload[TokenFields.TOKEN_EXPIRE_FIELD.value], timezone.utc),
+                    session=session
+                )
+            else:
+                revoked = await RefreshTokenService.delete_refresh_token(jti=jti, session=session)
         except Exception as e:
-            logger.error(f"Error with logout: {e}")
+            logger.warning("Error with logout: {}", e)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid or expired refresh token",
@@ -270,38 +308,49 @@ class AuthService:
             secure=True,
             samesite="strict"
         )
+        return LogoutResponse(revoked=revoked)
 
 
 class RefreshTokenService:
-    @staticmethod
-    async def get_refresh_token_by_jti(jti: uuid.UUID, session: AsyncSession) -> RefreshTokenSchema:
-        token = await RefreshTokenDAO.find_one_or_none(session=session, jti=jti)
-        if token is None:
-            raise CannotFindRefreshToken(f"Cannot find token")
-        logger.info(f"Token with ID: {jti} found successfully")
-        return token
-
     @staticmethod
     async def add_refresh_token(token_data: RefreshTokenSchema, session: AsyncSession) -> RefreshTokenSchema:
         try:
             new_token = await RefreshTokenDAO.add(session=session, obj_in=token_data)
-            await session.commit()
-            logger.info(f"Refresh token with ID: {new_token.jti} created successfully")
+            logger.debug("Refresh token with ID: {} created successfully", new_token.jti)
             return new_token
         except Exception as e:
-            await session.rollback()
             msg = f"Cannot add refresh token: {e}"
             logger.error(msg)
             raise CannotAddRefreshToken(msg)
 
     @staticmethod
-    async def delete_refresh_token(jti: uuid.UUID, session: AsyncSession) -> None:
+    async def delete_refresh_token(jti: uuid.UUID, session: AsyncSession) -> bool:
+        """Удаление одним DELETE ... RETURNING; False, если токена уже нет"""
         try:
-            await RefreshTokenDAO.delete(session=session, jti=jti)
-            await session.commit()
-            logger.info(f"Refresh token with ID: {jti} deleted successfully")
+            deleted = await RefreshTokenDAO.delete_returning(session=session, jti=jti)
         except Exception as e:
-            await session.rollback()
             msg = f"Cannot delete refreash token: {e}"
             logger.error(msg)
             raise CannotDeleteRefreshToken(msg)
+
+        if deleted:
+            logger.debug("Refresh token with ID: {} deleted successfully", jti)
+        return bool(deleted)
+
+    @staticmethod
+    async def revoke_refresh_token(jti: uuid.UUID, expires_at: datetime, session: AsyncSession) -> bool:
+        """Отзыв refresh токена для режима проверки отзыва в памяти"""
+        try:
+            deleted = await RefreshTokenDAO.delete_returning(session=session, jti=jti)
+            if deleted:
+                await RevokedTokenDAO.add(session=session, obj_in={"jti": jti, "expires_at": expires_at})
+        except Exception as e:
+            msg = f"Cannot revoke refresh token: {e}"
+            logger.error(msg)
+            raise CannotDeleteRefreshToken(msg)
+
+        if not deleted:
+            return False
+        revocation_list.revoke(jti, expires_at.timestamp())
+        logger.debug("Refresh token with ID: {} revoked successfully", jti)
+        return True
@@ -0,0 +1,100 @@
+import asyncio
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from loguru import logger
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.auth.models import RefreshTokenModel, RevokedTokenModel
+from src.core.config import settings
+
+
+class ExpiredTokenSweeper:
+    """
+    Фоновое удаление истекших refresh токенов (и записей об отозванных токенах) пачками по expires_at.
+    На PostgreSQL одновременно чистит только один воркер - остальные не получают advisory lock и пропускают проход.
+    """
+
+    MODELS = (RefreshTokenModel, RevokedTokenModel)
+    LOCK_KEY = zlib.crc32(b"jwtauth:expired_token_sweeper")
+
+    def __init__(self, batch_size: int, pause_seconds: float):
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self.runs = 0
+        self.skipped = 0
+        self.deleted: Dict[str, int] = {model.__tablename__: 0 for model in self.MODELS}
+        self.last_run_at: Optional[datetime] = None
+
+    async def _try_lock(self, conn: AsyncConnection) -> bool:
+        if conn.dialect.name != "postgresql":
+            return True
+        locked = (await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.LOCK_KEY})).scalar()
+        await conn.commit()
+        return bool(locked)
+
+    async def _unlock(self, conn: AsyncConnection) -> None:
+        if conn.dialect.name == "postgresql":
+            await conn.rollback()
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.LOCK_KEY})
+            await conn.commit()
+
+    async def _sweep_model(self, conn: AsyncConnection, model, now: datetime) -> int:
+        expired = (
+            select(model.jti)
+            .where(model.expires_at < now)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        total = 0
+        while True:
+            result = await conn.execute(delete(model).where(model.jti.in_(expired)))
+            await conn.commit()
+            total += result.rowcount
+            if result.rowcount < self.batch_size:
+                return total
+            await asyncio.sleep(self.pause_seconds)
+
+    async def sweep(self, engine: AsyncEngine) -> Optional[Dict[str, int]]:
+        """Один проход; None, если чистит другой воркер"""
+        now = datetime.now(timezone.utc)
+        # Session-level advisory lock живет на соединении, поэтому все пачки идут через одно соединение
+        async with engine.connect() as conn:
+            if not await self._try_lock(conn):
+                self.skipped += 1
+                return None
+            try:
+                deleted = {model.__tablename__: await self._sweep_model(conn, model, now) for model in self.MODELS}
+            finally:
+                await self._unlock(conn)
+
+        self.runs += 1
+        self.last_run_at = now
+        for table, count in deleted.items():
+            self.deleted[table] += count
+        logger.info("Expired token sweep removed {}", deleted)
+        return deleted
+
+    async def run(self, engine: AsyncEngine, interval: float) -> None:
+        while True:
+            try:
+                await self.sweep(engine)
+            except Exception as e:
+                logger.warning("Cannot sweep expired tokens: {}", e)
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "deleted": dict(self.deleted),
+            "last_run_at": self.last_run_at,
+        }
+
+
+expired_token_sweeper = ExpiredTokenSweeper(
+    batch_size=settings.auth.TOKEN_SWEEP_BATCH_SIZE,
+    pause_seconds=settings.auth.TOKEN_SWEEP_PAUSE_SECONDS,
+)
@@ -0,0 +1,61 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from src.auth.schemas import TokenFields
+from src.core.config import settings
+
+
+class VerifiedTokenCache:
+    """LRU уже проверенных токенов: claims хранятся до истечения exp токена"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, Dict[str, Any]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str | bytes) -> bytes:
+        if isinstance(token, str):
+            token = token.encode("utf-8")
+        return hashlib.sha256(token).digest()
+
+    def get(self, token: str | bytes) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        claims = self._entries.get(key)
+        if claims is None:
+            self.misses += 1
+            return None
+        if claims[TokenFields.TOKEN_EXPIRE_FIELD.value] <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(claims)
+
+    def put(self, token: str | bytes, claims: Dict[str, Any]) -> None:
+        if self.max_size <= 0:
+            return
+        key = self._key(token)
+        self._entries[key] = dict(claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+verified_token_cache = VerifiedTokenCache(max_size=settings.auth.TOKEN_CACHE_MAX_SIZE)
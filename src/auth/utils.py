@@ -1,19 +1,28 @@
-import json
-import uuid
+import asyncio
+import hashlib
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
 
 import jwt
 from passlib.context import CryptContext
 
+from src.auth.keys import key_manager
 from src.auth.schemas import TokenFields
+from src.auth.token_cache import verified_token_cache
 from src.core.config import settings
+from src.exceptions.exception_auth import PasswordHashingUnavailable
+from src.monitoring.metrics import Timer, auth_jwt_seconds, auth_password_hash_seconds
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_password_executor: Executor | None = None
+_password_jobs_in_flight: int = 0
+
 
 def encode_jwt(
         payload: dict,
-        private_key: str = settings.auth.private_key,
+        private_key: str | None = None,
         algorithm: str = settings.auth.ALGORITHM,
         expire_minutes: int = settings.auth.ACCESS_TOKEN_EXPIRE_MINUTES,
         expire_timedelta: timedelta | None = None,
@@ -33,26 +42,49 @@ def encode_jwt(
     if jti is not None:
         to_encode.update({TokenFields.TOKEN_JTI_FIELD.value: jti})
 
-    encoded = jwt.encode(
-        to_encode,
-        private_key,
-        algorithm=algorithm,
-    )
+    with Timer(auth_jwt_seconds, "sign"):
+        # Явно переданный ключ или другой алгоритм - через PyJWT, иначе быстрый путь
+        if private_key is not None or algorithm != key_manager.algorithm:
+            return jwt.encode(
+                to_encode,
+                private_key if private_key is not None else key_manager.private_key,
+                algorithm=algorithm,
+            )
 
-    return encoded
+        return key_manager.signer.encode(to_encode)
 
 
 def decode_jwt(
         token: str | bytes,
-        public_key: str = settings.auth.public_key,
+        public_key: str | None = None,
         algorithm: str = settings.auth.ALGORITHM,
 ) -> dict:
-    decoded = jwt.decode(
-        token,
-        public_key,
-        algorithms=[algorithm],
-    )
-    return decoded
+    with Timer(auth_jwt_seconds, "verify"):
+        if public_key is not None or algorithm != key_manager.algorithm:
+            return jwt.decode(
+                token,
+                public_key if public_key is not None else key_manager.public_key,
+                algorithms=[algorithm],
+            )
+
+        return key_manager.verifier.decode(token)
+
+
+def decode_jwt_cached(token: str | bytes) -> dict:
+    """Декодирование токена с кэшем уже проверенных подписей"""
+    if not settings.auth.TOKEN_CACHE_ENABLED:
+        return decode_jwt(token)
+
+    payload = verified_token_cache.get(token)
+    if payload is None:
+        payload = decode_jwt(token)
+        verified_token_cache.put(token, payload)
+    return payload
+
+
+def hash_token(token: str) -> bytes:
+    """Дайджест токена для хранения в БД вместо самого токена"""
+    return hashlib.sha256(token.encode()).digest()
 
 
 def hash_password(password: str) -> str:
@@ -63,3 +95,74 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Проверка пароля"""
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def get_password_executor() -> Executor:
+    """Пул, в котором выполняется bcrypt (создается лениво)"""
+    global _password_executor
+    if _password_executor is None:
+        if settings.auth.PASSWORD_HASH_EXECUTOR == "process":
+            _password_executor = ProcessPoolExecutor(max_workers=settings.auth.PASSWORD_HASH_WORKERS)
+        else:
+            _password_executor = ThreadPoolExecutor(
+                max_workers=settings.auth.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+    return _password_executor
+
+
+def shutdown_password_executor() -> None:
+    """Остановить пул хэширования (при завершении приложения)"""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+        _password_executor = None
+
+
+def _release_password_job() -> None:
+    global _password_jobs_in_flight
+    _password_jobs_in_flight -= 1
+
+
+def _release_in_loop(loop: asyncio.AbstractEventLoop) -> Callable[[Future], None]:
+    # Колбэк завершения вызывается в потоке пула, а счетчик меняется только в потоке event loop
+    def callback(_: Future) -> None:
+        try:
+            loop.call_soon_threadsafe(_release_password_job)
+        except RuntimeError:
+            # event loop уже закрыт
+            pass
+    return callback
+
+
+async def _run_in_password_executor(operation: str, func: Callable[..., Any], *args: Any) -> Any:
+    global _password_jobs_in_flight
+    max_jobs = settings.auth.PASSWORD_HASH_WORKERS + settings.auth.PASSWORD_HASH_QUEUE_SIZE
+    if _password_jobs_in_flight >= max_jobs:
+        raise PasswordHashingUnavailable("Too many password hashing requests, try again later")
+
+    loop = asyncio.get_running_loop()
+    future = get_password_executor().submit(func, *args)
+    _password_jobs_in_flight += 1
+    # Слот освобождается, когда задача закончилась в пуле, а не когда ее перестали ждать:
+    # после таймаута bcrypt продолжает занимать поток (из очереди задача снимается отменой)
+    future.add_done_callback(_release_in_loop(loop))
+
+    try:
+        with Timer(auth_password_hash_seconds, operation):
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=settings.auth.PASSWORD_HASH_TIMEOUT_SECONDS,
+            )
+    except asyncio.TimeoutError:
+        raise PasswordHashingUnavailable("Password hashing timed out")
+
+
+async def hash_password_async(password: str) -> str:
+    """Хэширование пароля вне event loop"""
+    return await _run_in_password_executor("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Проверка пароля вне event loop"""
+    return await _run_in_password_executor("verify", verify_password, plain_password, hashed_password)
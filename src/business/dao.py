@@ -4,3 +4,4 @@ from src.database.base import BaseDAO
 
 class BusinessProfileDAO(BaseDAO):
     model = BusinessProfileModel
+    cache_key_columns = ("id", "user_id")
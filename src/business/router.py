@@ -7,9 +7,9 @@ from starlette import status
 
 from src.business.schemas import BusinessProfileOut, BusinessProfileCreate, BusinessProfileUpdate
 from src.business.service import BusinessProfileService
-from src.database.session import get_session
-from src.users.dependencies import get_current_business_user
-from src.users.schemas import UserOut
+from src.database.session import get_read_session, get_session
+from src.users.dependencies import get_current_business_principal
+from src.users.schemas import UserPrincipal
 
 router = APIRouter(
     prefix="/api/business-profile",
@@ -20,8 +20,8 @@ router = APIRouter(
 @router.get("/{business_id}", response_model=BusinessProfileOut)
 async def get_business(
         business_id: uuid.UUID,
-        business_user: Annotated[UserOut, Depends(get_current_business_user)],
-        session: Annotated[AsyncSession, Depends(get_session)]
+        business_user: Annotated[UserPrincipal, Depends(get_current_business_principal)],
+        session: Annotated[AsyncSession, Depends(get_read_session)]
 ):
     return await BusinessProfileService.get_business_profile_by_id(
         business_id=business_id,
@@ -33,7 +33,7 @@ async def get_business(
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=BusinessProfileOut)
 async def create_business(
         business_profile: BusinessProfileCreate,
-        business_user: Annotated[UserOut, Depends(get_current_business_user)],
+        business_user: Annotated[UserPrincipal, Depends(get_current_business_principal)],
         session: Annotated[AsyncSession, Depends(get_session)]
 ):
     business_profile.user_id = business_user.id
@@ -47,7 +47,7 @@ async def create_business(
 async def update_business(
         business_id: uuid.UUID,
         business_profile: BusinessProfileUpdate,
-        business_user: Annotated[UserOut, Depends(get_current_business_user)],
+        business_user: Annotated[UserPrincipal, Depends(get_current_business_principal)],
         session: Annotated[AsyncSession, Depends(get_session)]
 ):
     return await BusinessProfileService.update_business_profile(
@@ -61,7 +61,7 @@ async def update_business(
 @router.delete("/{business_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_business(
         business_id: uuid.UUID,
-        business_user: Annotated[UserOut, Depends(get_current_business_user)],
+        business_user: Annotated[UserPrincipal, Depends(get_current_business_principal)],
         session: Annotated[AsyncSession, Depends(get_session)]
 ):
     await BusinessProfileService.delete_business_profile(
@@ -5,8 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.business.dao import BusinessProfileDAO
 from src.business.schemas import BusinessProfileInDB, BusinessProfileUpdate, BusinessProfileCreate
-from src.business.utils import try_find_business_profile
-from src.exceptions.exception_auth import NotEnoughPermissions
+from src.business.utils import check_business_profile_scope
 from src.exceptions.exception_business import (
     CannotAddBusinessProfile,
     CannotUpdateBusinessProfile,
@@ -28,15 +27,13 @@ class BusinessProfileService:
         )
         if existing_business_profile:
             msg = f"User with ID: {business_profile.user_id} already has a business profile"
-            logger.error(msg)
+            logger.warning(msg)
             raise UserAlreadyHasBusinessProfile(msg)
         try:
             business_profile_db = await BusinessProfileDAO.add(session=session, obj_in=business_profile)
-            await session.commit()
-            logger.info(f"Created business profile: {business_profile_db.id}")
+            logger.info("Created business profile: {}", business_profile_db.id)
             return business_profile_db
         except Exception as e:
-            await session.rollback()
             msg = f"Error adding business profile: {e}"
             logger.error(msg)
             raise CannotAddBusinessProfile(msg)
@@ -48,13 +45,12 @@ class BusinessProfileService:
             user_id: uuid.UUID,
             session: AsyncSession
     ) -> BusinessProfileInDB:
-        business_profile = await try_find_business_profile(session=session, business_id=business_id)
-
-        if business_profile.user_id != user_id:
-            msg = "Not enough permissions to get this business profile"
-            logger.error(msg)
-            raise NotEnoughPermissions(msg)
-
+        scope_result, business_profile = await BusinessProfileDAO.find_scoped(
+            session,
+            scope={"user_id": user_id},
+            id=business_id
+        )
+        check_business_profile_scope(scope_result, business_id, action="get")
         return business_profile
 
     @classmethod
@@ -65,28 +61,24 @@ class BusinessProfileService:
             user_id: uuid.UUID,
             session: AsyncSession
     ) -> BusinessProfileInDB:
-        existing_profile = await try_find_business_profile(session=session, business_id=business_id)
-
-        if existing_profile.user_id != user_id:
-            msg = "Not enough permissions to update this business profile"
-            raise NotEnoughPermissions(msg)
-
         update_data = business_profile.model_dump(exclude_unset=True)
         try:
-            new_business_profile = await BusinessProfileDAO.update(
+            # Владелец проверяется в WHERE того же UPDATE
+            scope_result, new_business_profile = await BusinessProfileDAO.update_scoped(
                 session,
-                BusinessProfileDAO.model.id == business_id,
-                obj_in=update_data
+                obj_in=update_data,
+                scope={"user_id": user_id},
+                id=business_id
             )
-            await session.commit()
-            logger.info(f"Updated business profile: {new_business_profile.id}")
-            return new_business_profile
         except Exception as e:
-            await session.rollback()
             msg = f"Error updating business profile (business_id - {business_id}): {e}"
             logger.error(msg)
             raise CannotUpdateBusinessProfile(msg)
 
+        check_business_profile_scope(scope_result, business_id, action="update")
+        logger.info("Updated business profile: {}", new_business_profile.id)
+        return new_business_profile
+
     @classmethod
     async def delete_business_profile(
             cls,
@@ -94,19 +86,16 @@ class BusinessProfileService:
             user_id: uuid.UUID,
             session: AsyncSession
     ) -> None:
-        existing_profile = await try_find_business_profile(session=session, business_id=business_id)
-
-        if existing_profile.user_id != user_id:
-            msg = "Not enough permissions to delete this business profile"
-            logger.error(msg)
-            raise NotEnoughPermissions("Not enough permissions to delete this business profile")
-
         try:
-            await BusinessProfileDAO.delete(session=session, id=business_id)
-            logger.info(f"Deleted business profile: {business_id}")
-            await session.commit()
+            scope_result, _ = await BusinessProfileDAO.delete_scoped(
+                session,
+                scope={"user_id": user_id},
+                id=business_id
+            )
         except Exception as e:
-            await session.rollback()
             msg = f"Error deleting business profile (business_id - {business_id}): {e}"
             logger.error(msg)
             raise CannotDeleteBusinessProfile(msg)
+
+        check_business_profile_scope(scope_result, business_id, action="delete")
+        logger.info("Deleted business profile: {}", business_id)
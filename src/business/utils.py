@@ -1,20 +1,18 @@
 import uuid
 
 from loguru import logger
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.business.dao import BusinessProfileDAO
-from src.business.schemas import BusinessProfileInDB
+from src.database.base import ScopeResult
+from src.exceptions.exception_auth import NotEnoughPermissions
 from src.exceptions.exception_business import BusinessProfileNotFound
 
 
-async def try_find_business_profile(session: AsyncSession, business_id: uuid.UUID) -> BusinessProfileInDB:
-    existing_business_profile = await BusinessProfileDAO.find_one_or_none(
-        session=session,
-        id=business_id
-    )
-    if existing_business_profile is None:
+def check_business_profile_scope(scope_result: ScopeResult, business_id: uuid.UUID, action: str) -> None:
+    if scope_result == ScopeResult.NOT_FOUND:
         msg = f"Business profile with ID: {business_id} not found"
-        logger.error(msg)
+        logger.warning(msg)
         raise BusinessProfileNotFound(msg)
-    return existing_business_profile
+    if scope_result == ScopeResult.FORBIDDEN:
+        msg = f"Not enough permissions to {action} this business profile"
+        logger.warning(msg)
+        raise NotEnoughPermissions(msg)
@@ -0,0 +1,247 @@
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Sequence, Set
+from urllib.parse import urlparse
+
+from src.core.config import CacheSettings
+from src.exceptions.exception_cache import CacheBackendError
+
+
+class CacheBackend:
+    """Общий интерфейс кэша: значения - bytes, TTL в секундах"""
+
+    # Виден ли кэш другим процессам (имеет смысл использовать как второй уровень)
+    shared: bool = False
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return (await self.get_many([key]))[0]
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self.set_many({key: value}, ttl=ttl)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
+    async def set_many(self, items: Mapping[str, bytes], ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> int:
+        raise NotImplementedError
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, channel: str) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Кэш в памяти процесса; pub/sub доставляет сообщения подписчикам того же процесса"""
+
+    def __init__(self, key_prefix: str = ""):
+        self.key_prefix = key_prefix
+        self._data: Dict[str, tuple[Optional[float], bytes]] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        now = time.monotonic()
+        values = []
+        for key in keys:
+            entry = self._data.get(self.key_prefix + key)
+            if entry is not None and entry[0] is not None and entry[0] <= now:
+                del self._data[self.key_prefix + key]
+                entry = None
+            values.append(entry[1] if entry is not None else None)
+        return values
+
+    async def set_many(self, items: Mapping[str, bytes], ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        for key, value in items.items():
+            self._data[self.key_prefix + key] = (expires_at, value)
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self._data.pop(self.key_prefix + key, None) is not None for key in keys)
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        for queue in self._subscribers.get(channel, ()):
+            queue.put_nowait(message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[bytes]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(channel, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[channel].discard(queue)
+
+
+class _ConnectionLost(Exception):
+    pass
+
+
+class _RespConnection:
+    """Соединение по протоколу Redis (RESP2) с поддержкой конвейера команд"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @staticmethod
+    def encode(*args) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode()
+            elif isinstance(arg, (int, float)):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    async def read_reply(self):
+        line = await self.reader.readline()
+        if not line:
+            raise _ConnectionLost("Connection closed by cache server")
+        prefix, body = line[:1], line[1:-2]
+        if prefix == b"+":
+            return body.decode()
+        if prefix == b"-":
+            # Ошибка команды не ломает соединение - возвращается как значение
+            return CacheBackendError(body.decode())
+        if prefix == b":":
+            return int(body)
+        if prefix == b"$":
+            length = int(body)
+            if length == -1:
+                return None
+            data = await self.reader.readexactly(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(body)
+            if length == -1:
+                return None
+            return [await self.read_reply() for _ in range(length)]
+        raise CacheBackendError(f"Unexpected reply from cache server: {line!r}")
+
+    async def pipeline(self, commands: Sequence[tuple]) -> list:
+        self.writer.write(b"".join(self.encode(*command) for command in commands))
+        await self.writer.drain()
+        replies = [await self.read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, CacheBackendError):
+                raise reply
+        return replies
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Кэш на сервере с протоколом Redis; команды одного вызова отправляются одним конвейером"""
+
+    shared = True
+
+    def __init__(self, url: str, key_prefix: str = "", socket_timeout: float = 1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.key_prefix = key_prefix
+        self.socket_timeout = socket_timeout
+        self._connection: Optional[_RespConnection] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> _RespConnection:
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port),
+                timeout=self.socket_timeout,
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            raise CacheBackendError(f"Cannot connect to cache server {self.host}:{self.port}: {e}") from e
+
+        connection = _RespConnection(reader, writer)
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            try:
+                await connection.pipeline(setup)
+            except (OSError, asyncio.IncompleteReadError, _ConnectionLost) as e:
+                connection.close()
+                raise CacheBackendError(f"Cannot set up cache connection: {e!r}") from e
+        return connection
+
+    async def _execute(self, commands: Sequence[tuple]) -> list:
+        async with self._lock:
+            if self._connection is None:
+                self._connection = await self._connect()
+            try:
+                return await asyncio.wait_for(self._connection.pipeline(commands), timeout=self.socket_timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, _ConnectionLost) as e:
+                self._drop_connection()
+                raise CacheBackendError(f"Cache server request failed: {e!r}") from e
+
+    def _drop_connection(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        (values,) = await self._execute([("MGET", *(self.key_prefix + key for key in keys))])
+        return values
+
+    async def set_many(self, items: Mapping[str, bytes], ttl: Optional[float] = None) -> None:
+        if not items:
+            return
+        if ttl:
+            ttl_ms = max(int(ttl * 1000), 1)
+            commands = [("SET", self.key_prefix + key, value, "PX", ttl_ms) for key, value in items.items()]
+        else:
+            commands = [("SET", self.key_prefix + key, value) for key, value in items.items()]
+        await self._execute(commands)
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        (deleted,) = await self._execute([("DEL", *(self.key_prefix + key for key in keys))])
+        return deleted
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        await self._execute([("PUBLISH", channel, message)])
+
+    async def subscribe(self, channel: str) -> AsyncIterator[bytes]:
+        # Подписка занимает отдельное соединение
+        connection = await self._connect()
+        try:
+            await connection.pipeline([("SUBSCRIBE", channel)])
+            while True:
+                reply = await connection.read_reply()
+                if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                    yield reply[2]
+        except (OSError, asyncio.IncompleteReadError, _ConnectionLost) as e:
+            raise CacheBackendError(f"Cache subscription failed: {e!r}") from e
+        finally:
+            connection.close()
+
+    async def close(self) -> None:
+        async with self._lock:
+            self._drop_connection()
+
+
+def create_cache_backend(cache_settings: CacheSettings) -> CacheBackend:
+    if cache_settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(
+            url=cache_settings.CACHE_REDIS_URL,
+            key_prefix=cache_settings.CACHE_KEY_PREFIX,
+            socket_timeout=cache_settings.CACHE_SOCKET_TIMEOUT_SECONDS,
+        )
+    return MemoryCacheBackend(key_prefix=cache_settings.CACHE_KEY_PREFIX)
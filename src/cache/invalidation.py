@@ -0,0 +1,97 @@
+import asyncio
+import json
+import uuid
+from typing import Any, Callable, Coroutine, Dict, Optional, Set
+
+from loguru import logger
+
+from src.cache.backends import CacheBackend, create_cache_backend
+from src.core.config import settings
+from src.exceptions.exception_cache import CacheBackendError
+
+InvalidationHandler = Callable[[str], None]
+
+
+class InvalidationBus:
+    """
+    Рассылка инвалидаций локальных кэшей между воркерами через pub/sub бэкенда.
+    Сообщения от своего же процесса игнорируются - локальный кэш к этому моменту уже сброшен.
+    """
+
+    RECONNECT_DELAY_SECONDS = 1.0
+
+    def __init__(self, backend: CacheBackend, channel: str):
+        self.backend = backend
+        self.channel = channel
+        self.node_id = uuid.uuid4().hex
+        self._handlers: Dict[str, InvalidationHandler] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    def register(self, namespace: str, handler: InvalidationHandler) -> None:
+        self._handlers[namespace] = handler
+
+    def publish(self, namespace: str, key: str) -> None:
+        """Разослать инвалидацию, не дожидаясь отправки"""
+        message = json.dumps({"node": self.node_id, "ns": namespace, "key": key}).encode()
+        self.spawn(self.backend.publish(self.channel, message))
+
+    def spawn(self, coro: Coroutine[Any, Any, Any]) -> None:
+        """Выполнить операцию с бэкендом в фоне; ошибки только логируются"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            coro.close()
+            return
+        task = loop.create_task(self._run_detached(coro))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    @staticmethod
+    async def _run_detached(coro: Coroutine[Any, Any, Any]) -> None:
+        try:
+            await coro
+        except CacheBackendError as e:
+            logger.warning("Background cache operation failed: {}", e)
+
+    def dispatch(self, message: bytes) -> None:
+        try:
+            data = json.loads(message)
+            node, namespace, key = data["node"], data["ns"], data["key"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Malformed cache invalidation message: {!r}", message)
+            return
+        if node == self.node_id:
+            return
+        handler = self._handlers.get(namespace)
+        if handler is not None:
+            handler(key)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self.backend.subscribe(self.channel):
+                    self.dispatch(message)
+            except CacheBackendError as e:
+                logger.warning("Cache invalidation subscription lost: {}", e)
+            await asyncio.sleep(self.RECONNECT_DELAY_SECONDS)
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self.backend.close()
+
+
+cache_backend = create_cache_backend(settings.cache)
+invalidation_bus = InvalidationBus(cache_backend, settings.cache.CACHE_INVALIDATION_CHANNEL)
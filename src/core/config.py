@@ -1,8 +1,9 @@
+import tempfile
 from pathlib import Path
-from typing import List, Union
+from typing import List, Literal, Optional, Union
 
 from dotenv import load_dotenv
-from pydantic import AnyHttpUrl, field_validator
+from pydantic import AnyHttpUrl, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 BASE_DIR = Path(__file__).parent.parent.parent
@@ -19,12 +20,68 @@ class DBSettings(BaseSettings):
 
     TEST_DATABASE_URL: str = "sqlite+aiosqlite:///:memory:"
 
+    # Реплика для чтения; без REPLICA_HOST чтения идут в основную БД (тоже в READ ONLY транзакциях).
+    # Пользователь, логин, пароль и имя БД по умолчанию как у основной
+    REPLICA_HOST: Optional[str] = None
+    REPLICA_PORT: int = 5432
+    REPLICA_USER: Optional[str] = None
+    REPLICA_PASSWORD: Optional[str] = None
+    REPLICA_DB: Optional[str] = None
+    # Сколько секунд после записи клиент читает из основной БД (read-your-writes)
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Пул соединений на один воркер: всего соединений не больше
+    # (POOL_SIZE + POOL_MAX_OVERFLOW) * число воркеров, это должно помещаться в max_connections
+    POOL_SIZE: int = 10
+    POOL_MAX_OVERFLOW: int = 10
+    POOL_TIMEOUT_SECONDS: float = 30.0
+    POOL_RECYCLE_SECONDS: int = 1800
+    POOL_PRE_PING: bool = True
+    # Сколько соединений открыть при старте приложения
+    POOL_MIN_SIZE: int = 2
+
+    # Кэши подготовленных запросов asyncpg и SQLAlchemy
+    ASYNCPG_STATEMENT_CACHE_SIZE: int = 100
+    PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # PgBouncer в режиме transaction pooling: подготовленные запросы не переживают транзакцию,
+    # поэтому кэши выключаются, а имена подготовленных запросов делаются уникальными
+    PGBOUNCER_MODE: bool = False
+
+    # Read-through кэш строк в DAO (включается в наследниках через cache_key_columns)
+    ENTITY_CACHE_ENABLED: bool = True
+
+    # Заранее собранные запросы DAO для поиска по одной колонке
+    STATEMENT_CACHE_ENABLED: bool = True
+
+    # Пакетные операции DAO: размер пачки и с какого объема вставки использовать COPY (asyncpg)
+    BULK_CHUNK_SIZE: int = 1000
+    BULK_COPY_THRESHOLD: int = 10_000
+
+    # Счетчик запросов к БД на HTTP запрос: в лог попадают запросы сверх бюджета
+    # и запросы одной формы, выполненные QUERY_REPEAT_THRESHOLD и более раз (похоже на N+1)
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_BUDGET_PER_REQUEST: int = 10
+    QUERY_REPEAT_THRESHOLD: int = 3
+
+    @property
+    def max_pool_connections(self) -> int:
+        return self.POOL_SIZE + self.POOL_MAX_OVERFLOW
+
     @property
     def database_url(self):
         return (f"postgresql+asyncpg://"
                 f"{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@"
                 f"{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}")
 
+    @property
+    def replica_url(self) -> Optional[str]:
+        # Пустой REPLICA_HOST= из .env значит то же, что и отсутствие реплики
+        if not self.REPLICA_HOST:
+            return None
+        return (f"postgresql+asyncpg://"
+                f"{self.REPLICA_USER or self.POSTGRES_USER}:{self.REPLICA_PASSWORD or self.POSTGRES_PASSWORD}@"
+                f"{self.REPLICA_HOST}:{self.REPLICA_PORT}/{self.REPLICA_DB or self.POSTGRES_DB}")
+
 
 class AuthSettings(BaseSettings):
     PRIVATE_KEY_PATH: Path = BASE_DIR / "certs" / "jwt-private.pem"
@@ -32,6 +89,32 @@ class AuthSettings(BaseSettings):
     ALGORITHM: str = "RS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # Как часто проверять mtime файлов ключей
+    KEYS_RELOAD_CHECK_SECONDS: float = 5.0
+
+    # Кэш уже проверенных access токенов
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+
+    # Собирать principal из claims access токена без запроса пользователя в БД
+    STATELESS_PRINCIPAL: bool = False
+
+    # database - refresh токен должен быть в refresh_tokens (запрос в БД на каждую проверку);
+    # memory - достаточно подписи и exp, отозванные jti хранятся в памяти
+    REFRESH_REVOCATION_MODE: Literal["database", "memory"] = "database"
+    REVOCATION_SYNC_SECONDS: float = 60.0
+
+    # Фоновое удаление истекших refresh токенов
+    TOKEN_SWEEP_ENABLED: bool = True
+    TOKEN_SWEEP_INTERVAL_SECONDS: float = 600.0
+    TOKEN_SWEEP_BATCH_SIZE: int = 1000
+    TOKEN_SWEEP_PAUSE_SECONDS: float = 0.1
+
+    # Пул для bcrypt: хэширование не должно блокировать event loop
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10.0
 
     @property
     def private_key(self) -> str:
@@ -44,6 +127,45 @@ class AuthSettings(BaseSettings):
         return self.PUBLIC_KEY_PATH.read_text()
 
 
+class CacheSettings(BaseSettings):
+    # memory - кэш внутри процесса; redis - общий кэш для всех воркеров и нод
+    CACHE_BACKEND: Literal["memory", "redis"] = "memory"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_KEY_PREFIX: str = "jwtauth:"
+    CACHE_INVALIDATION_CHANNEL: str = "jwtauth:invalidate"
+    CACHE_SOCKET_TIMEOUT_SECONDS: float = 1.0
+
+
+class LogSettings(BaseSettings):
+    LOG_LEVEL: str = "INFO"
+    # JSON строка на запись вместо текстового формата
+    LOG_JSON: bool = False
+    # Запись в sink из фонового потока, обработчик запроса только кладет запись в очередь
+    LOG_ENQUEUE: bool = True
+    # Сколько записей в окно пропускать с одного места вызова (0 - без ограничения),
+    # после лимита пропускается каждая LOG_SAMPLE_EVERY-я (0 - ни одной)
+    LOG_RATE_LIMIT: int = 20
+    LOG_RATE_LIMIT_WINDOW_SECONDS: float = 1.0
+    LOG_SAMPLE_EVERY: int = 100
+
+
+class MonitoringSettings(BaseSettings):
+    # Prometheus метрики на /metrics: middleware и события движков подключаются только при включении
+    METRICS_ENABLED: bool = True
+
+    # Профилирование отдельных запросов: middleware подключается только при PROFILING_ENABLED.
+    # Профилируется запрос с заголовком PROFILING_HEADER = PROFILING_TOKEN или доля PROFILING_SAMPLE_RATE запросов;
+    # тот же токен нужен для просмотра и скачивания профилей
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: Optional[str] = None
+    PROFILING_HEADER: str = "X-Profile-Token"
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_SECONDS: float = 0.001
+    # Последние PROFILING_MAX_FILES профилей хранятся в PROFILING_DIR
+    PROFILING_DIR: Path = Path(tempfile.gettempdir()) / "jwtauth-profiles"
+    PROFILING_MAX_FILES: int = 100
+
+
 class Settings(BaseSettings):
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = [
         "http://localhost:3000",
@@ -61,10 +183,24 @@ class Settings(BaseSettings):
             return v
         raise ValueError(f"Invalid CORS origins format: {v}")
 
+    # Чем сериализуются JSON ответы: orjson или стандартный json из Starlette
+    JSON_RESPONSE_RENDERER: Literal["orjson", "json"] = "orjson"
+
     db: DBSettings = DBSettings()
     auth: AuthSettings = AuthSettings()
+    cache: CacheSettings = CacheSettings()
+    log: LogSettings = LogSettings()
+    monitoring: MonitoringSettings = MonitoringSettings()
 
     model_config = SettingsConfigDict(env_file=".env", extra="allow")
 
+    @model_validator(mode="after")
+    def check_revocation_broadcast(self) -> "Settings":
+        # Отзыв в режиме memory доходит до других воркеров только через общий канал Redis;
+        # с кэшем в памяти отозванный токен оставался бы валидным на них до REVOCATION_SYNC_SECONDS
+        if self.auth.REFRESH_REVOCATION_MODE == "memory" and self.cache.CACHE_BACKEND != "redis":
+            raise ValueError("REFRESH_REVOCATION_MODE=memory requires CACHE_BACKEND=redis")
+        return self
+
 
 settings = Settings()
@@ -1,13 +1,13 @@
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
 
+from src.core.responses import default_response_class
 from src.exceptions.base import AppError
 
 
 def add_exception_handlers(app):
     @app.exception_handler(AppError)
     async def app_error_handler(request: Request, exc: AppError):
-        return JSONResponse(
+        return default_response_class(
             status_code=exc.status_code,
             content={
                 "error": {
@@ -21,7 +21,7 @@ def add_exception_handlers(app):
 
     @app.exception_handler(HTTPException)
     async def http_exception_handler(request: Request, exc: HTTPException):
-        return JSONResponse(
+        return default_response_class(
             status_code=exc.status_code,
             content={
                 "error": {
@@ -0,0 +1,90 @@
+import sys
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+from loguru import logger
+
+from src.core.config import LogSettings
+
+# Уровни, которые никогда не ограничиваются
+UNTHROTTLED_LEVELS = {"CRITICAL"}
+
+
+class LogThrottle:
+    """
+    Ограничение частоты логов для каждого места вызова (модуль, функция, строка):
+    в окне пропускаются первые rate_limit записей, дальше - каждая sample_every-я.
+    Число отброшенных записей попадает в extra["suppressed"] следующей пропущенной.
+    """
+
+    def __init__(self, rate_limit: int, window_seconds: float, sample_every: int):
+        self.rate_limit = rate_limit
+        self.window_seconds = window_seconds
+        self.sample_every = sample_every
+        # место вызова -> [начало окна, записей в окне, отброшено]
+        self._sites: Dict[Tuple[str, str, int], list] = {}
+        self._lock = threading.Lock()
+        self.suppressed_total = 0
+
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        if self.rate_limit <= 0 or record["level"].name in UNTHROTTLED_LEVELS:
+            return True
+
+        site = (record["name"], record["function"], record["line"])
+        now = time.monotonic()
+        with self._lock:
+            state = self._sites.get(site)
+            if state is None or now - state[0] >= self.window_seconds:
+                suppressed = state[2] if state is not None else 0
+                state = self._sites[site] = [now, 0, suppressed]
+            state[1] += 1
+            seen = state[1]
+            allowed = seen <= self.rate_limit or (
+                    self.sample_every > 0 and (seen - self.rate_limit) % self.sample_every == 0
+            )
+            if not allowed:
+                state[2] += 1
+                self.suppressed_total += 1
+                return False
+            suppressed, state[2] = state[2], 0
+
+        if suppressed:
+            record["extra"]["suppressed"] = suppressed
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {"call_sites": len(self._sites), "suppressed": self.suppressed_total}
+
+
+log_throttle = LogThrottle(rate_limit=0, window_seconds=1.0, sample_every=0)
+
+TEXT_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+)
+
+
+def _text_format(record: Dict[str, Any]) -> str:
+    if "suppressed" in record["extra"]:
+        return TEXT_FORMAT + " <yellow>(+{extra[suppressed]} suppressed)</yellow>\n{exception}"
+    return TEXT_FORMAT + "\n{exception}"
+
+
+def setup_logging(log_settings: LogSettings) -> None:
+    """Переустановить sink loguru: запись в фоновом потоке, JSON или текст, ограничение частоты"""
+    log_throttle.rate_limit = log_settings.LOG_RATE_LIMIT
+    log_throttle.window_seconds = log_settings.LOG_RATE_LIMIT_WINDOW_SECONDS
+    log_throttle.sample_every = log_settings.LOG_SAMPLE_EVERY
+
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        level=log_settings.LOG_LEVEL,
+        serialize=log_settings.LOG_JSON,
+        format=_text_format,
+        filter=log_throttle,
+        enqueue=log_settings.LOG_ENQUEUE,
+        backtrace=False,
+        diagnose=False,
+    )
@@ -0,0 +1,34 @@
+from typing import Any, Dict, Type
+
+import orjson
+from fastapi import responses
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from src.core.config import settings
+
+
+def _orjson_default(obj: Any) -> Any:
+    """То, что orjson не сериализует сам: pydantic модели, если их вернули без response_model"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(responses.ORJSONResponse):
+    """
+    ORJSONResponse из FastAPI с default для pydantic моделей;
+    OPT_SERIALIZE_NUMPY не нужен - numpy в проекте нет
+    """
+    option = orjson.OPT_NON_STR_KEYS
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=self.option)
+
+
+RESPONSE_CLASSES: Dict[str, Type[JSONResponse]] = {
+    "orjson": ORJSONResponse,
+    "json": JSONResponse,
+}
+
+default_response_class = RESPONSE_CLASSES[settings.JSON_RESPONSE_RENDERER]
@@ -1,25 +1,308 @@
-from typing import TypeVar, Generic, Optional, Union, Dict, Any
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from enum import Enum
+from typing import (
+    TypeVar, Generic, Optional, Union, Dict, Any, Tuple, Hashable, Iterable, Iterator, List, Sequence, AsyncIterator,
+    Type, Callable
+)
 
 from loguru import logger
 from pydantic import BaseModel
-from sqlalchemy import select, insert, delete, update
+from sqlalchemy import select, insert, delete, update, inspect, event, tuple_, literal, bindparam, Select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from src.database.session import Base
+from src.cache.invalidation import invalidation_bus
+from src.core.config import settings
+from src.database.cache import EntityCache, entity_caches
+from src.database.serialization import json_default, restore
+from src.database.session import Base, SESSION_BYPASS_CACHE_KEY, SESSION_REPLICA_KEY
+from src.exceptions.exception_dao import InvalidCursorError
 
 ModelType = TypeVar("ModelType", bound=Base)
 SchemaType = TypeVar("SchemaType", bound=BaseModel)
 
+# INSERT с поддержкой ON CONFLICT для диалектов
+DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+# Флаг в session.info: в текущей транзакции уже были изменения через DAO
+SESSION_WRITES_KEY = "dao_writes"
+# Строки, которые нужно сбросить в кэшах остальных воркеров после коммита
+SESSION_INVALIDATIONS_KEY = "dao_cache_invalidations"
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    session.info.pop(SESSION_WRITES_KEY, None)
+    for cache, pk in session.info.pop(SESSION_INVALIDATIONS_KEY, ()):
+        # Повторно: до коммита другой запрос мог успеть положить в кэш старую версию
+        cache.invalidate(pk)
+        cache.broadcast(cache.primary_key, pk)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(SESSION_WRITES_KEY, None)
+    session.info.pop(SESSION_INVALIDATIONS_KEY, None)
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@dataclass
+class Page(Generic[ModelType]):
+    """Страница keyset пагинации; next_cursor = None на последней странице"""
+    items: List[ModelType]
+    next_cursor: Optional[str]
+
+
+class ScopeResult(str, Enum):
+    """Результат операции, ограниченной владельцем строки"""
+    OK = "ok"
+    NOT_FOUND = "not_found"
+    FORBIDDEN = "forbidden"
+
 
 class BaseDAO(Generic[ModelType, SchemaType]):
     model = None
 
+    # Колонки, по которым find_one_or_none может отвечать из кэша (пусто - кэш выключен)
+    cache_key_columns: Tuple[str, ...] = ()
+    # Колонки, которые никогда не попадают в кэш (в том числе общий); запросы с ними идут в БД
+    cache_exclude_columns: Tuple[str, ...] = ()
+    cache_ttl_seconds: float = 30.0
+    cache_max_entries: int = 10_000
+
+    @classmethod
+    def get_cache(cls) -> Optional[EntityCache]:
+        if not cls.cache_key_columns or not settings.db.ENTITY_CACHE_ENABLED:
+            return None
+        cache = cls.__dict__.get("_cache")
+        if cache is None:
+            cache = EntityCache(
+                name=cls.model.__tablename__,
+                primary_key=cls._primary_key_name(),
+                key_columns=dict.fromkeys((cls._primary_key_name(), *cls.cache_key_columns)),
+                ttl_seconds=cls.cache_ttl_seconds,
+                max_entries=cls.cache_max_entries,
+                column_types=cls._column_types(),
+                bus=invalidation_bus,
+            )
+            cls._cache = cache
+            entity_caches[cache.name] = cache
+        return cache
+
+    @classmethod
+    def _primary_key_name(cls) -> str:
+        return inspect(cls.model).primary_key[0].key
+
+    @classmethod
+    def _column_types(cls) -> Dict[str, Optional[type]]:
+        column_types = {}
+        for attr in inspect(cls.model).column_attrs:
+            try:
+                column_types[attr.key] = attr.columns[0].type.python_type
+            except NotImplementedError:
+                column_types[attr.key] = None
+        return column_types
+
+    @classmethod
+    def _cached_columns(cls) -> List[str]:
+        return [
+            attr.key for attr in inspect(cls.model).column_attrs
+            if attr.key not in cls.cache_exclude_columns
+        ]
+
+    @classmethod
+    def _snapshot(cls, obj: ModelType) -> Dict[str, Any]:
+        return {column: getattr(obj, column) for column in cls._cached_columns()}
+
+    @classmethod
+    def _cache_lookup(cls, cache: EntityCache, filter: tuple, filter_by: dict) -> Optional[Tuple[str, Hashable]]:
+        if filter or len(filter_by) != 1:
+            return None
+        column, value = next(iter(filter_by.items()))
+        if column not in cache.key_columns or not isinstance(value, Hashable):
+            return None
+        return column, value
+
+    @classmethod
+    def _invalidate(cls, session: AsyncSession, *pks: Any) -> None:
+        cache = cls.get_cache()
+        if cache is None:
+            return
+        pending = session.info.setdefault(SESSION_INVALIDATIONS_KEY, [])
+        for pk in pks:
+            cache.invalidate(pk)
+            pending.append((cache, pk))
+
+    @classmethod
+    async def invalidate_cache(cls, **lookup: Any) -> None:
+        """Сбросить закэшированную строку по одной из колонок кэша (например, после каскадного удаления)"""
+        cache = cls.get_cache()
+        if cache is None:
+            return
+        for column, value in lookup.items():
+            await cache.evict_by(column, value)
+
+    @staticmethod
+    def _may_store(session: AsyncSession) -> bool:
+        # Незакоммиченные изменения текущей транзакции и строки с отстающей реплики в кэш не попадают
+        return not session.info.get(SESSION_WRITES_KEY) and not session.info.get(SESSION_REPLICA_KEY)
+
     @classmethod
     async def find_one_or_none(cls, session: AsyncSession, *filter, **filter_by) -> Optional[ModelType]:
-        query = select(cls.model).filter(*filter).filter_by(**filter_by)
+        cache = cls.get_cache() if not session.info.get(SESSION_BYPASS_CACHE_KEY) else None
+        lookup = cls._cache_lookup(cache, filter, filter_by) if cache is not None else None
+        # Из снимка без исключенных колонок ORM объект не собрать - такие DAO читают объект из БД
+        if lookup is not None and not cls.cache_exclude_columns:
+            snapshot = await cache.fetch(*lookup)
+            if snapshot is not None:
+                return cls.model(**snapshot)
+
+        query, params = cls._lookup_query(filter, filter_by)
+        result = await session.execute(query, params)
+        obj = result.scalars().one_or_none()
+
+        if lookup is not None and obj is not None and cls._may_store(session):
+            await cache.store(cls._snapshot(obj))
+        return obj
+
+    @classmethod
+    def _projection_columns(cls, columns: Optional[Sequence[str]], schema: Optional[Type[BaseModel]]) -> List[str]:
+        if columns is not None:
+            return list(columns)
+        if schema is None:
+            raise ValueError("Either columns or schema is required for a projection")
+        model_columns = {attr.key for attr in inspect(cls.model).column_attrs}
+        return [field for field in schema.model_fields if field in model_columns]
+
+    @classmethod
+    def _cached_statement(cls, key: Hashable, build: Callable[[], Select]) -> Select:
+        """
+        Готовые выражения на DAO: собранный один раз Select запоминает свой cache key,
+        и SQLAlchemy не обходит дерево выражения на каждом запросе.
+        """
+        statements = cls.__dict__.get("_statements")
+        if statements is None:
+            statements = cls._statements = {}
+        query = statements.get(key)
+        if query is None:
+            query = statements[key] = build()
+        return query
+
+    @classmethod
+    def _base_select(cls, columns: Optional[Tuple[str, ...]] = None) -> Select:
+        if columns is None:
+            return cls._cached_statement(("select",), lambda: select(cls.model))
+        return cls._cached_statement(
+            ("select", columns),
+            lambda: select(*(getattr(cls.model, column) for column in columns))
+        )
+
+    @classmethod
+    def _lookup_query(
+            cls,
+            filter: tuple,
+            filter_by: Dict[str, Any],
+            columns: Optional[Tuple[str, ...]] = None,
+    ) -> Tuple[Select, Dict[str, Any]]:
+        """Поиск по одной колонке на равенство идет через заранее собранный запрос с bindparam"""
+        if settings.db.STATEMENT_CACHE_ENABLED and not filter and len(filter_by) == 1:
+            column, value = next(iter(filter_by.items()))
+            if value is not None:
+                param = f"lookup_{column}"
+                query = cls._cached_statement(
+                    ("lookup", columns, column),
+                    lambda: cls._base_select(columns).where(getattr(cls.model, column) == bindparam(param))
+                )
+                return query, {param: value}
+        return cls._base_select(columns).filter(*filter).filter_by(**filter_by), {}
+
+    @staticmethod
+    def _project(
+            row: Dict[str, Any],
+            columns: Sequence[str],
+            schema: Optional[Type[SchemaType]]
+    ) -> Union[Dict[str, Any], SchemaType]:
+        data = {column: row[column] for column in columns}
+        return schema.model_validate(data) if schema is not None else data
+
+    @classmethod
+    async def find_one_projection(
+            cls,
+            session: AsyncSession,
+            *filter,
+            columns: Optional[Sequence[str]] = None,
+            schema: Optional[Type[SchemaType]] = None,
+            use_cache: bool = True,
+            **filter_by
+    ) -> Optional[Union[Dict[str, Any], SchemaType]]:
+        """
+        Чтение только нужных колонок без создания ORM объекта: dict или сразу pydantic схема.
+        Если запрос можно обслужить из кэша, берется снимок строки; при промахе читается
+        строка целиком (тоже без ORM), чтобы положить ее в кэш.
+        use_cache=False - всегда читать из БД, мимо кэша (например, учетные данные);
+        так же читаются проекции с колонками из cache_exclude_columns и чтения клиента сразу после его записи.
+        С реплики прочитанное в кэш не кладется.
+        """
+        columns = cls._projection_columns(columns, schema)
+        use_cache = (
+                use_cache
+                and not session.info.get(SESSION_BYPASS_CACHE_KEY)
+                and not set(columns) & set(cls.cache_exclude_columns)
+        )
+        cache = cls.get_cache() if use_cache else None
+        lookup = cls._cache_lookup(cache, filter, filter_by) if cache is not None else None
+        if lookup is not None:
+            snapshot = await cache.fetch(*lookup)
+            if snapshot is not None:
+                return cls._project(snapshot, columns, schema)
+            selected = cls._cached_columns()
+        else:
+            selected = columns
+
+        query, params = cls._lookup_query(filter, filter_by, tuple(selected))
+        result = await session.execute(query, params)
+        row = result.mappings().one_or_none()
+        if row is None:
+            return None
+
+        if lookup is not None and cls._may_store(session):
+            await cache.store(dict(row))
+        return cls._project(row, columns, schema)
+
+    @classmethod
+    async def find_all_projection(
+            cls,
+            session: AsyncSession,
+            *filter,
+            columns: Optional[Sequence[str]] = None,
+            schema: Optional[Type[SchemaType]] = None,
+            offset: Optional[int] = None,
+            limit: Optional[int] = None,
+            **filter_by
+    ) -> List[Union[Dict[str, Any], SchemaType]]:
+        columns = cls._projection_columns(columns, schema)
+        query = (
+            cls._base_select(tuple(columns))
+            .filter(*filter)
+            .filter_by(**filter_by)
+            .offset(offset)
+            .limit(limit)
+        )
         result = await session.execute(query)
-        return result.scalars().one_or_none()
+        return [cls._project(row, columns, schema) for row in result.mappings()]
 
     @classmethod
     async def find_all(
@@ -40,6 +323,89 @@ class BaseDAO(Generic[ModelType, SchemaType]):
         result = await session.execute(query)
         return result.scalars().all()
 
+    @classmethod
+    def _order_columns(cls, order_by: Sequence[str]) -> List[str]:
+        """Колонки сортировки с первичным ключом в конце - порядок должен быть однозначным"""
+        primary_key = cls._primary_key_name()
+        columns = list(order_by)
+        if primary_key not in columns:
+            columns.append(primary_key)
+        return columns
+
+    @classmethod
+    def _encode_cursor(cls, obj: ModelType, columns: Sequence[str]) -> str:
+        values = [getattr(obj, column) for column in columns]
+        raw = json.dumps(values, default=json_default, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def _decode_cursor(cls, cursor: str, columns: Sequence[str]) -> List[Any]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(columns):
+                raise ValueError("cursor does not match the sort order")
+            column_types = cls._column_types()
+            return [restore(value, column_types.get(column)) for value, column in zip(values, columns)]
+        except (binascii.Error, ValueError, TypeError) as e:
+            raise InvalidCursorError(f"Invalid pagination cursor: {e}")
+
+    @classmethod
+    async def find_page(
+            cls,
+            session: AsyncSession,
+            *filter,
+            order_by: Sequence[str] = (),
+            descending: bool = False,
+            limit: int = 50,
+            cursor: Optional[str] = None,
+            **filter_by
+    ) -> Page[ModelType]:
+        """
+        Keyset пагинация: следующая страница начинается после последней строки предыдущей,
+        поэтому время ответа не зависит от глубины страницы (в отличие от offset).
+        """
+        columns = cls._order_columns(order_by)
+        attributes = [getattr(cls.model, column) for column in columns]
+        query = select(cls.model).filter(*filter).filter_by(**filter_by)
+        if cursor is not None:
+            values = cls._decode_cursor(cursor, columns)
+            key = tuple_(*attributes)
+            last = tuple_(*(literal(value, attribute.type) for value, attribute in zip(values, attributes)))
+            query = query.where(key < last if descending else key > last)
+        query = query.order_by(
+            *(attribute.desc() if descending else attribute.asc() for attribute in attributes)
+        ).limit(limit + 1)
+
+        result = await session.execute(query)
+        items = list(result.scalars().all())
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = cls._encode_cursor(items[-1], columns)
+        return Page(items=items, next_cursor=next_cursor)
+
+    @classmethod
+    async def stream(
+            cls,
+            session: AsyncSession,
+            *filter,
+            order_by: Sequence[str] = (),
+            chunk_size: Optional[int] = None,
+            **filter_by
+    ) -> AsyncIterator[ModelType]:
+        """Итерация по строкам через server-side курсор пачками по chunk_size, без загрузки всего результата"""
+        query = (
+            select(cls.model)
+            .filter(*filter)
+            .filter_by(**filter_by)
+            .order_by(*(getattr(cls.model, column) for column in order_by))
+            .execution_options(yield_per=chunk_size or settings.db.BULK_CHUNK_SIZE)
+        )
+        result = await session.stream(query)
+        async for obj in result.scalars():
+            yield obj
+
     @classmethod
     async def add(
             cls,
@@ -50,6 +416,7 @@ class BaseDAO(Generic[ModelType, SchemaType]):
             create_data = obj_in
         else:
             create_data = obj_in.model_dump(exclude_unset=True)
+        session.info[SESSION_WRITES_KEY] = True
         try:
             query = insert(cls.model).values(
                 **create_data).returning(cls.model)
@@ -65,10 +432,313 @@ class BaseDAO(Generic[ModelType, SchemaType]):
 
         return None
 
+    @classmethod
+    async def insert_or_ignore(
+            cls,
+            session: AsyncSession,
+            obj_in: Union[SchemaType, Dict[str, Any]],
+            conflict_columns: Optional[Tuple[str, ...]] = None,
+    ) -> Optional[ModelType]:
+        """
+        INSERT ... ON CONFLICT DO NOTHING RETURNING одним запросом.
+        Возвращает новую строку или None, если строка с такими уникальными значениями уже есть.
+        """
+        if isinstance(obj_in, dict):
+            create_data = obj_in
+        else:
+            create_data = obj_in.model_dump(exclude_unset=True)
+
+        dialect = session.get_bind().dialect.name
+        dialect_insert = DIALECT_INSERTS.get(dialect)
+        if dialect_insert is None:
+            raise NotImplementedError(f"INSERT ... ON CONFLICT is not supported for {dialect}")
+
+        session.info[SESSION_WRITES_KEY] = True
+        query = (
+            dialect_insert(cls.model)
+            .values(**create_data)
+            .on_conflict_do_nothing(index_elements=conflict_columns)
+            .returning(cls.model)
+        )
+        result = await session.execute(query)
+        return result.scalars().first()
+
+    @classmethod
+    async def find_cached(cls, **lookup: Any) -> Optional[Dict[str, Any]]:
+        """Снимок строки только из кэша, без запроса в БД"""
+        cache = cls.get_cache()
+        key = cls._cache_lookup(cache, (), lookup) if cache is not None else None
+        if key is None:
+            return None
+        return await cache.fetch(*key)
+
     @classmethod
     async def delete(cls, session: AsyncSession, *filter, **filter_by) -> None:
+        session.info[SESSION_WRITES_KEY] = True
+        query = delete(cls.model).filter(*filter).filter_by(**filter_by)
+        if cls.get_cache() is None:
+            await session.execute(query)
+            return
+
+        primary_key = getattr(cls.model, cls._primary_key_name())
+        result = await session.execute(query.returning(primary_key))
+        cls._invalidate(session, *result.scalars().all())
+
+    @classmethod
+    async def delete_returning(cls, session: AsyncSession, *filter, **filter_by) -> list[ModelType]:
+        """Удаление одним запросом DELETE ... RETURNING, возвращает удаленные строки"""
+        session.info[SESSION_WRITES_KEY] = True
+        query = delete(cls.model).filter(*filter).filter_by(**filter_by).returning(cls.model)
+        result = await session.execute(query)
+        deleted = result.scalars().all()
+        cls._invalidate(session, *(getattr(obj, cls._primary_key_name()) for obj in deleted))
+        return deleted
+
+    @classmethod
+    def _dump_many(cls, objs_in: Iterable[Union[SchemaType, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        return [
+            obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+            for obj_in in objs_in
+        ]
+
+    @staticmethod
+    def _check_same_columns(rows: List[Dict[str, Any]]) -> None:
+        """Список колонок COPY и SET в upsert берется из первой строки, поэтому у всех строк он должен совпадать"""
+        keys = rows[0].keys()
+        for index, row in enumerate(rows):
+            if row.keys() != keys:
+                raise ValueError(
+                    f"All rows must have the same columns: row {index} has {sorted(row)}, expected {sorted(keys)}"
+                )
+
+    @classmethod
+    async def add_many(
+            cls,
+            session: AsyncSession,
+            objs_in: Iterable[Union[SchemaType, Dict[str, Any]]],
+            chunk_size: Optional[int] = None,
+    ) -> int:
+        """
+        Многострочная вставка пачками через executemany.
+        На asyncpg вставки от BULK_COPY_THRESHOLD строк идут через COPY.
+        """
+        rows = cls._dump_many(objs_in)
+        if not rows:
+            return 0
+        session.info[SESSION_WRITES_KEY] = True
+        bind = session.get_bind()
+        if bind.dialect.driver == "asyncpg" and len(rows) >= settings.db.BULK_COPY_THRESHOLD:
+            return await cls._copy_many(session, rows)
+
+        for chunk in _chunks(rows, chunk_size or settings.db.BULK_CHUNK_SIZE):
+            await session.execute(insert(cls.model), chunk)
+        return len(rows)
+
+    @classmethod
+    async def _copy_many(cls, session: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+        """COPY через asyncpg: значения по умолчанию и преобразования типов делаются на стороне Python"""
+        cls._check_same_columns(rows)
+        table = cls.model.__table__
+        dialect = session.get_bind().dialect
+        columns = [
+            column for column in table.columns
+            if column.key in rows[0]
+            or (column.default is not None and (column.default.is_scalar or column.default.is_callable))
+        ]
+        processors = {column.key: column.type.bind_processor(dialect) for column in columns}
+
+        def value(row: Dict[str, Any], column) -> Any:
+            if column.key in row:
+                item = row[column.key]
+            elif column.default.is_callable:
+                item = column.default.arg(None)
+            else:
+                item = column.default.arg
+            processor = processors[column.key]
+            return processor(item) if processor is not None and item is not None else item
+
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name,
+            records=[tuple(value(row, column) for column in columns) for row in rows],
+            columns=[column.name for column in columns],
+            schema_name=table.schema,
+        )
+        return len(rows)
+
+    @classmethod
+    async def upsert_many(
+            cls,
+            session: AsyncSession,
+            objs_in: Iterable[Union[SchemaType, Dict[str, Any]]],
+            conflict_columns: Tuple[str, ...],
+            update_columns: Optional[Tuple[str, ...]] = None,
+            chunk_size: Optional[int] = None,
+    ) -> int:
+        """
+        INSERT ... ON CONFLICT DO UPDATE пачками через executemany.
+        По умолчанию обновляются все переданные колонки, кроме conflict_columns.
+        Возвращает число вставленных или обновленных строк (пропущенные DO NOTHING не считаются).
+        """
+        rows = cls._dump_many(objs_in)
+        if not rows:
+            return 0
+        cls._check_same_columns(rows)
+        dialect = session.get_bind().dialect.name
+        dialect_insert = DIALECT_INSERTS.get(dialect)
+        if dialect_insert is None:
+            raise NotImplementedError(f"INSERT ... ON CONFLICT is not supported for {dialect}")
+
+        if update_columns is None:
+            update_columns = tuple(key for key in rows[0] if key not in conflict_columns)
+        query = dialect_insert(cls.model)
+        if update_columns:
+            query = query.on_conflict_do_update(
+                index_elements=conflict_columns,
+                set_={column: query.excluded[column] for column in update_columns},
+            )
+        else:
+            query = query.on_conflict_do_nothing(index_elements=conflict_columns)
+
+        session.info[SESSION_WRITES_KEY] = True
+        # rowcount у executemany зависит от драйвера, поэтому строки считаются по RETURNING
+        query = query.returning(getattr(cls.model, cls._primary_key_name()))
+        affected = 0
+        for chunk in _chunks(rows, chunk_size or settings.db.BULK_CHUNK_SIZE):
+            result = await session.execute(query, chunk)
+            pks = result.scalars().all()
+            affected += len(pks)
+            cls._invalidate(session, *pks)
+        return affected
+
+    @classmethod
+    async def delete_many(cls, session: AsyncSession, *filter, **filter_by) -> int:
+        """Удаление по условию одним запросом, возвращает число удаленных строк"""
+        session.info[SESSION_WRITES_KEY] = True
         query = delete(cls.model).filter(*filter).filter_by(**filter_by)
-        await session.execute(query)
+        if cls.get_cache() is None:
+            result = await session.execute(query, execution_options={"synchronize_session": False})
+            return result.rowcount
+
+        primary_key = getattr(cls.model, cls._primary_key_name())
+        result = await session.execute(
+            query.returning(primary_key),
+            execution_options={"synchronize_session": False}
+        )
+        pks = result.scalars().all()
+        cls._invalidate(session, *pks)
+        return len(pks)
+
+    @classmethod
+    async def update_many(
+            cls,
+            session: AsyncSession,
+            *where,
+            obj_in: Union[SchemaType, Dict[str, Any]],
+    ) -> int:
+        """Обновление по условию одним запросом, возвращает число обновленных строк"""
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        session.info[SESSION_WRITES_KEY] = True
+        query = update(cls.model).where(*where).values(**update_data)
+        if cls.get_cache() is None:
+            result = await session.execute(query, execution_options={"synchronize_session": False})
+            return result.rowcount
+
+        primary_key = getattr(cls.model, cls._primary_key_name())
+        result = await session.execute(
+            query.returning(primary_key),
+            execution_options={"synchronize_session": False}
+        )
+        pks = result.scalars().all()
+        cls._invalidate(session, *pks)
+        return len(pks)
+
+    @classmethod
+    async def _probe_scope(cls, session: AsyncSession, **filter_by) -> ScopeResult:
+        """Только для неудачной операции: строки нет или она принадлежит другому владельцу"""
+        primary_key = getattr(cls.model, cls._primary_key_name())
+        query = select(primary_key).filter_by(**filter_by).limit(1)
+        found = (await session.execute(query)).first() is not None
+        return ScopeResult.FORBIDDEN if found else ScopeResult.NOT_FOUND
+
+    @staticmethod
+    def _merge_scope(scope: Dict[str, Any], filter_by: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Фильтр и условие владельца одним словарем; None, если колонка в них задана с разными значениями"""
+        if any(column in filter_by and filter_by[column] != value for column, value in scope.items()):
+            return None
+        return {**filter_by, **scope}
+
+    @classmethod
+    async def find_scoped(
+            cls,
+            session: AsyncSession,
+            scope: Dict[str, Any],
+            **filter_by
+    ) -> Tuple[ScopeResult, Optional[ModelType]]:
+        """Поиск строки с проверкой владельца; владелец сравнивается у уже загруженной строки"""
+        obj = await cls.find_one_or_none(session, **filter_by)
+        if obj is None:
+            return ScopeResult.NOT_FOUND, None
+        if any(getattr(obj, column) != value for column, value in scope.items()):
+            return ScopeResult.FORBIDDEN, None
+        return ScopeResult.OK, obj
+
+    @classmethod
+    async def update_scoped(
+            cls,
+            session: AsyncSession,
+            obj_in: Union[SchemaType, Dict[str, Any]],
+            scope: Dict[str, Any],
+            **filter_by
+    ) -> Tuple[ScopeResult, Optional[ModelType]]:
+        """UPDATE ... WHERE <фильтр> AND <владелец> RETURNING одним запросом"""
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        if not update_data:
+            return await cls.find_scoped(session, scope, **filter_by)
+
+        where = cls._merge_scope(scope, filter_by)
+        if where is None:
+            return await cls._probe_scope(session, **filter_by), None
+
+        session.info[SESSION_WRITES_KEY] = True
+        query = (
+            update(cls.model)
+            .filter_by(**where)
+            .values(**update_data)
+            .returning(cls.model)
+        )
+        result = await session.execute(query)
+        obj = result.scalars().one_or_none()
+        if obj is None:
+            return await cls._probe_scope(session, **filter_by), None
+
+        cls._invalidate(session, getattr(obj, cls._primary_key_name()))
+        return ScopeResult.OK, obj
+
+    @classmethod
+    async def delete_scoped(
+            cls,
+            session: AsyncSession,
+            scope: Dict[str, Any],
+            **filter_by
+    ) -> Tuple[ScopeResult, list[ModelType]]:
+        """DELETE ... WHERE <фильтр> AND <владелец> RETURNING одним запросом"""
+        where = cls._merge_scope(scope, filter_by)
+        if where is None:
+            return await cls._probe_scope(session, **filter_by), []
+
+        deleted = await cls.delete_returning(session, **where)
+        if not deleted:
+            return await cls._probe_scope(session, **filter_by), deleted
+        return ScopeResult.OK, deleted
 
     @classmethod
     async def update(
@@ -82,6 +752,7 @@ class BaseDAO(Generic[ModelType, SchemaType]):
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
 
+        session.info[SESSION_WRITES_KEY] = True
         query = (
             update(cls.model).
             where(*where).
@@ -89,4 +760,7 @@ class BaseDAO(Generic[ModelType, SchemaType]):
             returning(cls.model)
         )
         result = await session.execute(query)
-        return result.scalars().one()
+        obj = result.scalars().one_or_none()
+        if obj is not None:
+            cls._invalidate(session, getattr(obj, cls._primary_key_name()))
+        return obj
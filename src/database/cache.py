@@ -0,0 +1,217 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from loguru import logger
+
+from src.cache.invalidation import InvalidationBus
+from src.database.serialization import json_default, restore
+from src.exceptions.exception_cache import CacheBackendError
+
+CacheKey = Tuple[str, Hashable]
+
+
+class EntityCache:
+    """
+    Read-through кэш строк одной модели.
+    Хранит снимки колонок по первичному ключу и индекс (колонка, значение) -> первичный ключ,
+    записи живут ttl_seconds, при переполнении вытесняются давно не использованные.
+    Если задан bus с общим бэкендом, он используется как второй уровень, а инвалидации
+    рассылаются остальным воркерам.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            primary_key: str,
+            key_columns: Iterable[str],
+            ttl_seconds: float,
+            max_entries: int,
+            column_types: Optional[Dict[str, Optional[type]]] = None,
+            bus: Optional[InvalidationBus] = None,
+    ):
+        self.name = name
+        self.primary_key = primary_key
+        self.key_columns = tuple(key_columns)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.invalidations = 0
+        self.column_types = column_types or {}
+        self.bus = bus
+        self._entities: OrderedDict[Hashable, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._index: Dict[CacheKey, Hashable] = {}
+        if bus is not None:
+            bus.register(self.namespace, self._on_remote_invalidation)
+
+    @property
+    def namespace(self) -> str:
+        return f"entity:{self.name}"
+
+    @property
+    def shared(self) -> bool:
+        return self.bus is not None and self.bus.backend.shared
+
+    def get(self, column: str, value: Hashable) -> Optional[Dict[str, Any]]:
+        pk = self._index.get((column, value))
+        entry = self._entities.get(pk) if pk is not None else None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, snapshot = entry
+        if expires_at <= time.monotonic() or snapshot.get(column) != value:
+            self._drop(pk)
+            self.misses += 1
+            return None
+
+        self._entities.move_to_end(pk)
+        self.hits += 1
+        return dict(snapshot)
+
+    def put(self, snapshot: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        pk = snapshot[self.primary_key]
+        self._drop(pk)
+        self._entities[pk] = (time.monotonic() + self.ttl_seconds, dict(snapshot))
+        for column in self.key_columns:
+            self._index[(column, snapshot[column])] = pk
+        while len(self._entities) > self.max_entries:
+            self._drop(next(iter(self._entities)))
+
+    def invalidate(self, pk: Hashable) -> None:
+        if pk in self._entities:
+            self.invalidations += 1
+        self._drop(pk)
+
+    def invalidate_by(self, column: str, value: Hashable) -> None:
+        pk = self._index.get((column, value))
+        if pk is not None:
+            self.invalidate(pk)
+
+    def broadcast(self, column: str, value: Hashable) -> None:
+        """Сбросить строку у остальных воркеров и в общем кэше (в фоне)"""
+        if self.bus is None:
+            return
+        self.bus.publish(self.namespace, f"{column}={value}")
+        if self.shared:
+            self.bus.spawn(self.bus.backend.delete(self._shared_key(column, value)))
+
+    async def evict_by(self, column: str, value: Hashable) -> None:
+        """Сбросить строку по любой колонке кэша во всех воркерах и в общем кэше"""
+        self.invalidate_by(column, value)
+        self.broadcast(column, value)
+        if not self.shared or column == self.primary_key:
+            return
+        try:
+            pk_raw = await self.bus.backend.get(self._shared_key(column, value))
+            if pk_raw is not None:
+                await self.bus.backend.delete(self._shared_key(self.primary_key, pk_raw.decode()))
+        except CacheBackendError as e:
+            logger.warning("Shared cache is unavailable: {}", e)
+
+    async def fetch(self, column: str, value: Hashable) -> Optional[Dict[str, Any]]:
+        """Локальный кэш, затем общий; найденное в общем кэше кладется в локальный"""
+        snapshot = self.get(column, value)
+        if snapshot is not None or not self.shared:
+            return snapshot
+
+        try:
+            snapshot = await self._shared_get(column, value)
+        except CacheBackendError as e:
+            logger.warning("Shared cache is unavailable: {}", e)
+            return None
+        if snapshot is not None:
+            self.shared_hits += 1
+            self.put(snapshot)
+        return snapshot
+
+    async def store(self, snapshot: Dict[str, Any]) -> None:
+        self.put(snapshot)
+        if not self.shared:
+            return
+
+        pk = snapshot[self.primary_key]
+        items = {self._shared_key(self.primary_key, pk): json.dumps(snapshot, default=json_default).encode()}
+        for column in self.key_columns:
+            if column != self.primary_key:
+                items[self._shared_key(column, snapshot[column])] = str(pk).encode()
+        try:
+            await self.bus.backend.set_many(items, ttl=self.ttl_seconds)
+        except CacheBackendError as e:
+            logger.warning("Shared cache is unavailable: {}", e)
+
+    async def _shared_get(self, column: str, value: Hashable) -> Optional[Dict[str, Any]]:
+        backend = self.bus.backend
+        if column == self.primary_key:
+            pk = value
+        else:
+            pk_raw = await backend.get(self._shared_key(column, value))
+            if pk_raw is None:
+                return None
+            pk = restore(pk_raw.decode(), self.column_types.get(self.primary_key))
+
+        raw = await backend.get(self._shared_key(self.primary_key, pk))
+        if raw is None:
+            return None
+        snapshot = {
+            key: restore(item, self.column_types.get(key))
+            for key, item in json.loads(raw).items()
+        }
+        # Индекс мог устареть (например, после смены email)
+        if snapshot.get(column) != value:
+            return None
+        return snapshot
+
+    def _shared_key(self, column: str, value: Any) -> str:
+        return f"{self.namespace}:{column}:{value}"
+
+    def _on_remote_invalidation(self, key: str) -> None:
+        column, _, value = key.partition("=")
+        try:
+            self.invalidate_by(column, restore(value, self.column_types.get(column)))
+        except ValueError:
+            logger.warning("Malformed invalidation key for {}: {}", self.name, key)
+
+    def clear(self) -> None:
+        self._entities.clear()
+        self._index.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entities),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_hits": self.shared_hits,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _drop(self, pk: Hashable) -> None:
+        entry = self._entities.pop(pk, None)
+        if entry is None:
+            return
+        snapshot = entry[1]
+        for column in self.key_columns:
+            key = (column, snapshot.get(column))
+            if self._index.get(key) == pk:
+                del self._index[key]
+
+
+entity_caches: Dict[str, EntityCache] = {}
+
+
+def get_entity_cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: cache.stats() for name, cache in entity_caches.items()}
+
+
+def clear_entity_caches() -> None:
+    for cache in entity_caches.values():
+        cache.clear()
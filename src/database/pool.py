@@ -0,0 +1,93 @@
+import time
+import uuid
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.config import DBSettings
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """QueuePool, который считает время получения соединения (включая открытие нового) и таймауты"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_avg": self.wait_seconds_total / self.checkouts if self.checkouts else 0.0,
+            "wait_seconds_max": self.wait_seconds_max,
+        }
+
+
+def _prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def engine_options(db_settings: DBSettings) -> Dict[str, Any]:
+    """Параметры create_async_engine для основного движка"""
+    if db_settings.PGBOUNCER_MODE:
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _prepared_statement_name,
+        }
+    else:
+        connect_args = {
+            "statement_cache_size": db_settings.ASYNCPG_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": db_settings.PREPARED_STATEMENT_CACHE_SIZE,
+        }
+    return {
+        "poolclass": InstrumentedPool,
+        "pool_size": db_settings.POOL_SIZE,
+        "max_overflow": db_settings.POOL_MAX_OVERFLOW,
+        "pool_timeout": db_settings.POOL_TIMEOUT_SECONDS,
+        "pool_recycle": db_settings.POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": db_settings.POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+async def warm_up_pool(engine: AsyncEngine, size: int) -> int:
+    """Открыть size соединений одновременно и вернуть их в пул"""
+    connections = []
+    try:
+        for _ in range(min(size, engine.pool.size())):
+            connections.append(await engine.connect())
+    finally:
+        for connection in connections:
+            await connection.close()
+    return len(connections)
+
+
+def get_pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    pool = engine.pool
+    if isinstance(pool, InstrumentedPool):
+        return pool.stats()
+    return {"status": pool.status()}
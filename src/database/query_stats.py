@@ -0,0 +1,110 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import DBSettings
+
+
+class QueryStats:
+    """Запросы к БД в рамках одного HTTP запроса (или блока track_queries)"""
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.parent = parent
+        self.count = 0
+        self.total_seconds = 0.0
+        # Текст SQL с плейсхолдерами - одинаковый для запросов одной формы с разными параметрами
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        stats = self
+        # Вложенные блоки (например, проверка в тесте вокруг запроса) видят те же запросы
+        while stats is not None:
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.statements[statement] += 1
+            stats = stats.parent
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries in {self.total_seconds * 1000:.1f} ms"]
+        lines.extend(f"  {count} x {' '.join(statement.split())}" for statement, count in self.statements.most_common())
+        return "\n".join(lines)
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Считать запросы, выполненные внутри блока (в том числе из greenlet SQLAlchemy - контекст у них общий)"""
+    stats = QueryStats(parent=current_query_stats.get())
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_query_stats.get() is not None:
+        conn.info.setdefault("query_stats_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    started = conn.info.get("query_stats_started")
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_stats_started"):
+        connection.info["query_stats_started"].pop()
+
+
+def instrument_query_stats(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """
+    Чистый ASGI middleware: запросы к БД за время HTTP запроса попадают в request.state.query_stats;
+    запросы сверх бюджета и повторяющиеся запросы одной формы (похоже на N+1) пишутся в лог
+    """
+
+    def __init__(self, app, db_settings: DBSettings):
+        self.app = app
+        self.budget = db_settings.QUERY_BUDGET_PER_REQUEST
+        self.repeat_threshold = db_settings.QUERY_REPEAT_THRESHOLD
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            scope.setdefault("state", {})["query_stats"] = stats
+            await self.app(scope, receive, send)
+
+        over_budget = stats.count > self.budget
+        repeated = stats.repeated(self.repeat_threshold)
+        if over_budget or repeated:
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            logger.warning(
+                "{} {}: {} queries (budget {}), {} repeated statements\n{}",
+                scope["method"], route, stats.count, self.budget, len(repeated), stats.report(),
+            )
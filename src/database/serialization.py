@@ -0,0 +1,30 @@
+import uuid
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Optional
+
+
+def json_default(value: Any) -> Any:
+    """default для json.dumps: UUID, даты и Enum сериализуются строками"""
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def restore(value: Any, python_type: Optional[type]) -> Any:
+    """Обратное к json_default: строка из JSON приводится к python типу колонки"""
+    if value is None or python_type is None or not isinstance(value, str):
+        return value
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if issubclass(python_type, Enum):
+        return python_type(value)
+    return value
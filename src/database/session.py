@@ -1,32 +1,142 @@
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, AsyncIterator, Dict
 
-from sqlalchemy import TIMESTAMP, func
+from fastapi import Request, Response
+from sqlalchemy import TIMESTAMP, event, func
 from sqlalchemy.ext.asyncio import (
     AsyncAttrs,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, ORMExecuteState, Session
 
 from src.core.config import settings
+from src.database.pool import engine_options
 
-engine = create_async_engine(url=settings.db.database_url)
+engine = create_async_engine(url=settings.db.database_url, **engine_options(settings.db))
 async_session_maker = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+if settings.db.replica_url is not None:
+    replica_engine = create_async_engine(url=settings.db.replica_url, **engine_options(settings.db))
+else:
+    replica_engine = engine
+# Сессии только для чтения: на PostgreSQL транзакции открываются как READ ONLY
+async_read_session_maker = async_sessionmaker(
+    replica_engine.execution_options(postgresql_readonly=True), class_=AsyncSession, expire_on_commit=False
+)
+async_primary_read_session_maker = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True), class_=AsyncSession, expire_on_commit=False
+)
+
+# Cookie с временем, до которого клиент читает из основной БД после своей записи
+READ_PRIMARY_COOKIE = "read_primary_until"
+SESSION_RESPONSE_KEY = "response"
+# Сессия читает с реплики: реплика может отставать, поэтому прочитанное не кладется в кэш
+SESSION_REPLICA_KEY = "replica"
+# Клиент недавно писал: кэш не читается, иначе он может не увидеть свою запись
+SESSION_BYPASS_CACHE_KEY = "bypass_cache"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_read_your_writes(orm_execute_state: ORMExecuteState) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    response = orm_execute_state.session.info.pop(SESSION_RESPONSE_KEY, None)
+    if response is not None:
+        response.set_cookie(
+            key=READ_PRIMARY_COOKIE,
+            value=str(int(time.time() + settings.db.READ_YOUR_WRITES_SECONDS)),
+            max_age=int(settings.db.READ_YOUR_WRITES_SECONDS),
+            httponly=True,
+            samesite="lax",
+        )
+
+
+def reads_from_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+SESSION_COMMITS_KEY = "commits"
+
+
+@event.listens_for(Session, "after_commit")
+def _count_commit(session: Session) -> None:
+    session.info[SESSION_COMMITS_KEY] = session.info.get(SESSION_COMMITS_KEY, 0) + 1
+
+
+class UnitOfWorkStats:
+    """Сколько коммитов приходится на один запрос"""
+
+    def __init__(self):
+        self.requests = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.max_commits_per_request = 0
+
+    def record(self, commits: int, rolled_back: bool) -> None:
+        self.requests += 1
+        self.commits += commits
+        self.rollbacks += rolled_back
+        self.max_commits_per_request = max(self.max_commits_per_request, commits)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "commits": self.commits,
+            "rollbacks": self.rollbacks,
+            "commits_per_request": self.commits / self.requests if self.requests else 0.0,
+            "max_commits_per_request": self.max_commits_per_request,
+        }
+
+
+unit_of_work_stats = UnitOfWorkStats()
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Одна транзакция на запрос: коммит, если обработчик завершился успешно, иначе откат"""
+    session.info[SESSION_COMMITS_KEY] = 0
+    rolled_back = False
+    try:
+        yield session
+    except BaseException:
+        rolled_back = True
+        await session.rollback()
+        raise
+    else:
+        if session.in_transaction():
+            await session.commit()
+    finally:
+        unit_of_work_stats.record(session.info.pop(SESSION_COMMITS_KEY, 0), rolled_back)
+
 
 # @asynccontextmanager
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_session(response: Response) -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
+        session.info[SESSION_RESPONSE_KEY] = response
+        async with unit_of_work(session):
+            yield session
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Сессия для чтения: реплика, или основная БД, если клиент недавно что-то записал"""
+    primary = reads_from_primary(request)
+    session_maker = async_primary_read_session_maker if primary else async_read_session_maker
+    async with session_maker() as session:
+        if primary:
+            session.info[SESSION_BYPASS_CACHE_KEY] = True
+        elif replica_engine is not engine:
+            session.info[SESSION_REPLICA_KEY] = True
         try:
             yield session
-        except Exception:
-            await session.rollback()
-            raise
         finally:
             await session.close()
 
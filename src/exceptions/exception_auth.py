@@ -41,5 +41,10 @@ class PayloadError(AuthError):
     status_code = 400
 
 
+class PasswordHashingUnavailable(AppError):
+    """Пул хэширования паролей перегружен или не ответил вовремя"""
+    status_code = 503
+
+
 class NotEnoughPermissions(AppError):
     status_code = 403
@@ -0,0 +1,6 @@
+from src.exceptions.base import AppError
+
+
+class CacheBackendError(AppError):
+    """Ошибка общего кэша (недоступен сервер, ошибка команды)"""
+    status_code = 503
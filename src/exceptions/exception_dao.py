@@ -34,3 +34,8 @@ class AlreadyExistsError(DAOError):
 class InvalidCredentialsError(DAOError):
     """Неверные данные"""
     status_code = 401
+
+
+class InvalidCursorError(DAOError):
+    """Некорректный курсор пагинации"""
+    status_code = 400
@@ -1,19 +1,74 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from loguru import logger
 from starlette.responses import RedirectResponse
 import uvicorn
 
+from src.auth import utils as auth_utils
+from src.auth.revocation import revocation_list, uses_memory_revocation
 from src.auth.router import router as auth_router
+from src.auth.sweeper import expired_token_sweeper
 from src.business.router import router as business_router
+from src.cache.invalidation import invalidation_bus
 from src.core.config import settings
 from src.core.exception_handlers import add_exception_handlers
+from src.core.logging import setup_logging
+from src.core.responses import default_response_class
+from src.database.pool import warm_up_pool
+from src.database.query_stats import QueryStatsMiddleware, instrument_query_stats
+from src.database.session import async_session_maker, engine, replica_engine
+from src.monitoring.metrics import MetricsMiddleware, instrument_engine
+from src.monitoring.profiler import ProfilingMiddleware, profile_store
+from src.monitoring.router import metrics_router, router as monitoring_router
 from src.users.router import router as user_router
 
-app: FastAPI = FastAPI(name="JWTAuthFastAPI", version="0.0.1")
+setup_logging(settings.log)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await invalidation_bus.start()
+    warmed = await warm_up_pool(engine, settings.db.POOL_MIN_SIZE)
+    logger.info(
+        f"Database pool warmed up with {warmed} connections, "
+        f"up to {settings.db.max_pool_connections} connections per worker"
+    )
+    background_tasks = []
+    if uses_memory_revocation():
+        async with async_session_maker() as session:
+            loaded = await revocation_list.load(session)
+        logger.info("Loaded {} revoked refresh tokens", loaded)
+        background_tasks.append(asyncio.create_task(
+            revocation_list.run_sync(async_session_maker, settings.auth.REVOCATION_SYNC_SECONDS)
+        ))
+    if settings.auth.TOKEN_SWEEP_ENABLED:
+        background_tasks.append(asyncio.create_task(
+            expired_token_sweeper.run(engine, settings.auth.TOKEN_SWEEP_INTERVAL_SECONDS)
+        ))
+    yield
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await invalidation_bus.stop()
+    auth_utils.shutdown_password_executor()
+    await logger.complete()
+
+
+app: FastAPI = FastAPI(
+    name="JWTAuthFastAPI",
+    version="0.0.1",
+    lifespan=lifespan,
+    default_response_class=default_response_class,
+)
 
 app.include_router(user_router)
 app.include_router(auth_router)
 app.include_router(business_router)
+app.include_router(monitoring_router)
+app.include_router(metrics_router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,6 +79,23 @@ app.add_middleware(
                    "Access-Control-Allow-Headers", "Content-Type"]
 )
 
+# Без PROFILING_ENABLED middleware не подключается вовсе
+if settings.monitoring.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, monitoring_settings=settings.monitoring, store=profile_store)
+
+if settings.db.QUERY_STATS_ENABLED:
+    instrument_query_stats(engine)
+    if replica_engine is not engine:
+        instrument_query_stats(replica_engine)
+    app.add_middleware(QueryStatsMiddleware, db_settings=settings.db)
+
+# Последним, чтобы быть внешним слоем и учитывать время остальных middleware
+if settings.monitoring.METRICS_ENABLED:
+    instrument_engine(engine, "primary")
+    if replica_engine is not engine:
+        instrument_engine(replica_engine, "replica")
+    app.add_middleware(MetricsMiddleware)
+
 add_exception_handlers(app)
 
 
@@ -0,0 +1,266 @@
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import Pool
+
+# Значения меток, которые не пришли из шаблона маршрута, сводятся к фиксированному набору,
+# чтобы число временных рядов не зависело от входящих запросов
+HTTP_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
+UNMATCHED_ROUTE = "<unmatched>"
+STATEMENT_TYPES = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY"}
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CPU_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Счетчик; наблюдения приходят из event loop, поэтому без блокировок"""
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # метки -> [счетчики по корзинам (без накопления) + корзина +Inf, сумма]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series is not None else 0
+
+    def samples(self) -> Iterable[str]:
+        for labels, (counts, total) in list(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+class CallbackMetric(Metric):
+    """Метрика, значения которой считываются в момент запроса /metrics"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), type_name: str = "gauge"):
+        super().__init__(name, documentation, labelnames)
+        self.type_name = type_name
+        self._callbacks: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set_function(self, callback: Callable[[], float], *labels: str) -> None:
+        self._callbacks[labels] = callback
+
+    def samples(self) -> Iterable[str]:
+        for labels, callback in list(self._callbacks.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(callback())}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"),
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"),
+))
+db_queries_total = registry.register(Counter(
+    "db_queries_total", "Executed SQL statements", ("engine", "statement"),
+))
+db_query_errors_total = registry.register(Counter(
+    "db_query_errors_total", "SQL statements that raised an error", ("engine",),
+))
+db_query_duration_seconds = registry.register(Histogram(
+    "db_query_duration_seconds", "SQL statement execution time", ("engine", "statement"),
+))
+auth_password_hash_seconds = registry.register(Histogram(
+    "auth_password_hash_seconds", "bcrypt hash/verify time including wait for the executor", ("operation",),
+))
+auth_jwt_seconds = registry.register(Histogram(
+    "auth_jwt_seconds", "JWT sign/verify CPU time", ("operation",), buckets=CPU_BUCKETS,
+))
+db_pool_connections = registry.register(CallbackMetric(
+    "db_pool_connections", "Database pool connections by state", ("engine", "state"),
+))
+db_pool_checkouts_total = registry.register(CallbackMetric(
+    "db_pool_checkouts_total", "Connection checkouts from the pool", ("engine",), type_name="counter",
+))
+db_pool_timeouts_total = registry.register(CallbackMetric(
+    "db_pool_timeouts_total", "Checkouts that timed out waiting for a connection", ("engine",), type_name="counter",
+))
+
+
+class MetricsMiddleware:
+    """Чистый ASGI middleware: число запросов и задержка по шаблону маршрута, а не по фактическому пути"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            method = scope["method"] if scope["method"] in HTTP_METHODS else "OTHER"
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            http_request_duration_seconds.observe(time.perf_counter() - started, method, route_path)
+            http_requests_total.inc(method, route_path, str(status_code))
+
+
+def _statement_type(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in STATEMENT_TYPES else "OTHER"
+
+
+# Пул движка -> значение метки engine; пул общий у движка и его копий из execution_options()
+_engine_names: "WeakKeyDictionary[Pool, str]" = WeakKeyDictionary()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["metrics_started"].pop()
+    name = _engine_names.get(conn.engine.pool, "unknown")
+    statement_type = _statement_type(statement)
+    db_queries_total.inc(name, statement_type)
+    db_query_duration_seconds.observe(time.perf_counter() - started, name, statement_type)
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("metrics_started"):
+        connection.info["metrics_started"].pop()
+    db_query_errors_total.inc(_engine_names.get(exception_context.engine.pool, "unknown"))
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Число и длительность запросов через события движка, плюс состояние пула"""
+    sync_engine = engine.sync_engine
+    _engine_names[sync_engine.pool] = name
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+    pool = sync_engine.pool
+    if hasattr(pool, "stats"):
+        for state in ("checked_out", "checked_in", "overflow"):
+            db_pool_connections.set_function(_pool_stat(pool, state), name, state)
+        db_pool_checkouts_total.set_function(_pool_stat(pool, "checkouts"), name)
+        db_pool_timeouts_total.set_function(_pool_stat(pool, "timeouts"), name)
+
+
+def _pool_stat(pool, key: str) -> Callable[[], float]:
+    return lambda: pool.stats()[key]
+
+
+class Timer:
+    """Контекстный менеджер для замера в гистограмму: with Timer(auth_jwt_seconds, "sign"): ..."""
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: Histogram, *labels: str):
+        self.histogram = histogram
+        self.labels = labels
+        self.started: Optional[float] = None
+
+    def __enter__(self) -> "Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
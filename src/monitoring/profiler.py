@@ -0,0 +1,161 @@
+import asyncio
+import hmac
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from src.core.config import MonitoringSettings, settings
+
+PROFILE_SUFFIX = ".folded"
+PROFILE_NAME_RE = re.compile(r"^[A-Za-z0-9_\-]+\.folded$")
+MAX_STACK_DEPTH = 128
+# Запросы к самим профилям не профилируются
+PROFILES_PATH = "/api/monitoring/profiles"
+
+
+class StackSampler:
+    """
+    Сэмплирующий профилировщик одного потока: фоновый поток каждые interval секунд
+    снимает стек целевого потока через sys._current_frames() и копит свернутые стеки
+    (формат flamegraph.pl / speedscope: "корень;...;лист число").
+    В async приложении целевой поток - поток event loop, поэтому в профиль попадают
+    и другие запросы, выполнявшиеся одновременно с профилируемым.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._labels: Dict[Any, str] = {}
+        self._path_prefixes = sorted({p for p in sys.path if p}, key=len, reverse=True)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            for prefix in self._path_prefixes:
+                if filename.startswith(prefix):
+                    filename = filename[len(prefix):].lstrip("/\\")
+                    break
+            label = self._labels[code] = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+        return label
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        if stack:
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Кольцевой буфер профилей на диске: хранится не больше max_files последних файлов"""
+
+    def __init__(self, directory: Path, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+
+    def save(self, name: str, content: str) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / name
+        path.write_text(content)
+        for old in self._files()[:-self.max_files]:
+            old.unlink(missing_ok=True)
+        return path
+
+    def _files(self) -> List[Path]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob(f"*{PROFILE_SUFFIX}"))
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": path.name, "size": path.stat().st_size}
+            for path in reversed(self._files())
+        ]
+
+    def get(self, name: str) -> Optional[Path]:
+        if not PROFILE_NAME_RE.match(name):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+
+
+class ProfilingMiddleware:
+    """
+    Чистый ASGI middleware: запрос профилируется, если в нем есть заголовок с токеном профилирования
+    или он попал в выборку sample_rate; остальные запросы проходят без дополнительной работы
+    """
+
+    def __init__(self, app, monitoring_settings: MonitoringSettings, store: ProfileStore):
+        self.app = app
+        self.header = monitoring_settings.PROFILING_HEADER.lower().encode()
+        self.token = (monitoring_settings.PROFILING_TOKEN or "").encode()
+        self.sample_rate = monitoring_settings.PROFILING_SAMPLE_RATE
+        self.interval = monitoring_settings.PROFILING_INTERVAL_SECONDS
+        self.store = store
+
+    def _should_profile(self, scope) -> bool:
+        if self.token:
+            for key, value in scope["headers"]:
+                if key == self.header:
+                    return hmac.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(PROFILES_PATH) or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            sampler.stop()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            # Время в начале имени - файлы сортируются по времени создания
+            label = re.sub(r"[^A-Za-z0-9]+", "_", f"{scope['method']} {route}").strip("_")
+            name = f"{time.time_ns()}-{label}-{int(elapsed_ms)}ms{PROFILE_SUFFIX}"
+            try:
+                await asyncio.to_thread(self.store.save, name, sampler.folded())
+                logger.info("Saved request profile {} ({} samples)", name, sampler.samples)
+            except OSError as e:
+                logger.warning("Cannot save request profile: {}", e)
+
+
+profile_store = ProfileStore(
+    directory=settings.monitoring.PROFILING_DIR,
+    max_files=settings.monitoring.PROFILING_MAX_FILES,
+)
@@ -0,0 +1,77 @@
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from src.auth.revocation import revocation_list
+from src.auth.sweeper import expired_token_sweeper
+from src.auth.token_cache import verified_token_cache
+from src.core.config import settings
+from src.core.logging import log_throttle
+from src.database.cache import get_entity_cache_stats
+from src.database.pool import get_pool_stats
+from src.database.session import engine, unit_of_work_stats
+from src.monitoring.metrics import registry
+from src.monitoring.profiler import profile_store
+
+router = APIRouter(
+    prefix="/api/monitoring",
+    tags=["monitoring"],
+)
+metrics_router = APIRouter(tags=["monitoring"])
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def verify_profiling_token(request: Request) -> None:
+    token = settings.monitoring.PROFILING_TOKEN
+    if not settings.monitoring.PROFILING_ENABLED or not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+    provided = request.headers.get(settings.monitoring.PROFILING_HEADER, "")
+    if not hmac.compare_digest(provided.encode(), token.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid profiling token")
+
+
+@router.get("/caches", dependencies=[Depends(verify_profiling_token)])
+async def get_cache_stats():
+    return {
+        "entities": get_entity_cache_stats(),
+        "verified_tokens": verified_token_cache.stats(),
+        "revoked_refresh_tokens": revocation_list.stats(),
+    }
+
+
+@router.get("/sweeper", dependencies=[Depends(verify_profiling_token)])
+async def get_sweeper_stats():
+    return expired_token_sweeper.stats()
+
+
+@router.get("/pool", dependencies=[Depends(verify_profiling_token)])
+async def get_database_pool_stats():
+    return get_pool_stats(engine)
+
+
+@router.get("/transactions", dependencies=[Depends(verify_profiling_token)])
+async def get_transaction_stats():
+    return unit_of_work_stats.stats()
+
+
+@router.get("/logging", dependencies=[Depends(verify_profiling_token)])
+async def get_logging_stats():
+    return log_throttle.stats()
+
+
+@router.get("/profiles", dependencies=[Depends(verify_profiling_token)])
+async def list_profiles():
+    return profile_store.list()
+
+
+@router.get("/profiles/{name}", dependencies=[Depends(verify_profiling_token)])
+async def download_profile(name: str):
+    path = profile_store.get(name)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
@@ -4,3 +4,5 @@ from src.users.models import UserModel
 
 class UserDAO(BaseDAO):
     model = UserModel
+    cache_key_columns = ("id", "email")
+    cache_exclude_columns = ("hashed_password",)
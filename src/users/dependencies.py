@@ -1,5 +1,5 @@
 import uuid
-from typing import Annotated
+from typing import Annotated, Any, Dict
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -8,52 +8,92 @@ from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth import utils as auth_utils
-from src.auth.schemas import TokenFields
-from src.database.session import get_session
+from src.auth.schemas import TokenFields, TokenTypes
+from src.core.config import settings
+from src.database.session import get_read_session
 from src.exceptions.exception_auth import PayloadError
-from src.exceptions.exception_user import UserNotFound
-from src.users.schemas import UserOut, UserRole
+from src.users.schemas import UserOut, UserPrincipal, UserRole
 from src.users.service import UserService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-async def get_current_user(
-        token: Annotated[str, Depends(oauth2_scheme)],
-        session: Annotated[AsyncSession, Depends(get_session)]
-) -> UserOut:
+def _decode_access_token(token: str) -> Dict[str, Any]:
     try:
-        payload = auth_utils.decode_jwt(token)
-        user_id_raw = payload.get(TokenFields.TOKEN_SUB_FIELD.value)
-        if user_id_raw is None:
-            msg = f"user_id not found in the payload"
-            logger.error(msg)
-            raise PayloadError(msg)
+        payload = auth_utils.decode_jwt_cached(token)
     except InvalidTokenError:
-        logger.error(f"Invalid token")
+        logger.warning("Invalid token")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if payload.get(TokenFields.TOKEN_TYPE_FIELD.value) != TokenTypes.ACCESS_TOKEN_TYPE.value:
+        logger.warning("Token is not an access token")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_id = uuid.UUID(user_id_raw)
-    user = await UserService.get_user_by_user_id(
-        user_id=user_id,
-        session=session
-    )
-    if user is None:
-        msg = f"User not found"
-        logger.error(msg)
-        raise UserNotFound(msg)
+    return payload
+
+
+def _get_user_id(payload: Dict[str, Any]) -> uuid.UUID:
+    user_id_raw = payload.get(TokenFields.TOKEN_SUB_FIELD.value)
+    if user_id_raw is None:
+        msg = f"user_id not found in the payload"
+        logger.warning(msg)
+        raise PayloadError(msg)
+    try:
+        return uuid.UUID(user_id_raw)
+    except ValueError:
+        msg = f"Invalid user_id in the payload"
+        logger.warning(msg)
+        raise PayloadError(msg)
+
+
+async def get_current_user(
+        token: Annotated[str, Depends(oauth2_scheme)],
+        session: Annotated[AsyncSession, Depends(get_read_session)]
+) -> UserOut:
+    """Полный пользователь из БД - для роутов, которым нужны его данные"""
+    payload = _decode_access_token(token)
+    user_id = _get_user_id(payload)
+
+    return await UserService.get_user_public(user_id=user_id, session=session)
+
+
+async def get_current_principal(
+        token: Annotated[str, Depends(oauth2_scheme)],
+        session: Annotated[AsyncSession, Depends(get_read_session)]
+) -> UserPrincipal:
+    """
+    id и роль текущего пользователя - для роутов, которым хватает проверки роли/владельца.
+    При STATELESS_PRINCIPAL собирается из проверенных claims без обращения к БД.
+    """
+    payload = _decode_access_token(token)
+    user_id = _get_user_id(payload)
+
+    if settings.auth.STATELESS_PRINCIPAL:
+        role_raw = payload.get(TokenFields.TOKEN_ROLE_FIELD.value)
+        try:
+            return UserPrincipal(id=user_id, role=UserRole(role_raw))
+        except ValueError:
+            msg = f"Invalid role in the payload"
+            logger.warning(msg)
+            raise PayloadError(msg)
 
-    return UserOut.model_validate(user)
+    return await UserService.get_user_principal(user_id=user_id, session=session)
 
 
-async def get_current_business_user(user: Annotated[UserOut, Depends(get_current_user)]) -> UserOut:
-    if user.role == UserRole.USER:
+async def get_current_business_principal(
+        principal: Annotated[UserPrincipal, Depends(get_current_principal)]
+) -> UserPrincipal:
+    if principal.role == UserRole.USER:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
         )
-    return user
+    return principal
@@ -5,9 +5,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from src.business.schemas import BusinessProfileOut
-from src.database.session import get_session
-from src.users.dependencies import get_current_user
-from src.users.schemas import UserOut, UserUpdate
+from src.database.session import get_read_session, get_session
+from src.users.dependencies import get_current_user, get_current_principal
+from src.users.schemas import UserOut, UserUpdate, UserPrincipal
 from src.users.service import UserService
 
 router = APIRouter(
@@ -26,7 +26,7 @@ async def read_user(
 @router.put("/me", response_model=UserOut, response_model_exclude_unset=True)
 async def update_user(
         new_user: UserUpdate,
-        user: Annotated[UserOut, Depends(get_current_user)],
+        user: Annotated[UserPrincipal, Depends(get_current_principal)],
         session: Annotated[AsyncSession, Depends(get_session)]
 ):
     return await UserService.update_user(
@@ -38,7 +38,7 @@ async def update_user(
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
-        user: Annotated[UserOut, Depends(get_current_user)],
+        user: Annotated[UserPrincipal, Depends(get_current_principal)],
         session: Annotated[AsyncSession, Depends(get_session)]
 ):
     await UserService.delete_user(user_id=user.id, session=session)
@@ -46,7 +46,7 @@ async def delete_user(
 
 @router.get("/business-profile", response_model=BusinessProfileOut)
 async def get_user_business_profile(
-        user: Annotated[UserOut, Depends(get_current_user)],
-        session: Annotated[AsyncSession, Depends(get_session)]
+        user: Annotated[UserPrincipal, Depends(get_current_principal)],
+        session: Annotated[AsyncSession, Depends(get_read_session)]
 ):
     return await UserService.get_user_business_profile(user_id=user.id, session=session)
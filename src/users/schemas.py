@@ -123,6 +123,21 @@ class UserJWTAccessData(BaseModel):
     role: UserRole
 
 
+# Модель аутентифицированного пользователя из access токена
+class UserPrincipal(BaseModel):
+    """id и роль текущего пользователя, достаточные для проверки прав без загрузки из БД"""
+    id: uuid.UUID
+    role: UserRole
+
+
+# Данные для проверки пароля при логине
+class UserCredentials(BaseModel):
+    """Только колонки, нужные для логина: id, хэш пароля и роль"""
+    id: uuid.UUID
+    hashed_password: str
+    role: UserRole
+
+
 # Модель для работы с JWT refresh
 class UserJWTRefreshData(BaseModel):
     """Модель для работы с JWT (создание refresh токена)"""
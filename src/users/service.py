@@ -10,58 +10,77 @@ from src.exceptions.exception_business import UserHasNotBusinessProfile
 from src.exceptions.exception_user import UserAlreadyExists, UserNotFound, UserCannotUpdate, UserCannotDelete, \
     InvalidPasswordOrUsername, UserCannotAdd
 from src.users.dao import UserDAO
-from src.users.schemas import UserCreate, UserUpdate, UserInDB
+from src.users.schemas import UserCreate, UserUpdate, UserInDB, UserCredentials, UserOut, UserPrincipal
 from src.users.utils import try_find_user
 
 
 class UserService:
     @classmethod
     async def create_user(cls, user: UserCreate, session: AsyncSession) -> UserInDB:
-        existing_user = await UserDAO.find_one_or_none(session=session, email=user.email)
-        if existing_user:
-            msg = f"User with email {user.email} already exists"
-            logger.error(msg)
+        msg = f"User with email {user.email} already exists"
+        # Дешевая проверка по индексу email до bcrypt; гонку двух регистраций отсекает ON CONFLICT
+        if await UserDAO.find_one_projection(session, columns=("id",), use_cache=False, email=user.email) is not None:
+            logger.warning(msg)
             raise UserAlreadyExists(msg)
 
+        hashed_password = await auth_utils.hash_password_async(user.password)
+
         try:
             user_data = user.model_dump(exclude={"password"})
-            hashed_password = auth_utils.hash_password(user.password)
             user_data["hashed_password"] = hashed_password
 
-            new_user = await UserDAO.add(session=session, obj_in=user_data)
-            await session.commit()
-
-            logger.info(f"User successfully created: ID - {new_user.id}")
-
-            return new_user
+            new_user = await UserDAO.insert_or_ignore(session=session, obj_in=user_data)
         except Exception as e:
-            await session.rollback()
             msg = f"Error adding user, email - {user.email}: {e}"
             logger.error(msg)
             raise UserCannotAdd(msg)
 
+        if new_user is None:
+            logger.warning(msg)
+            raise UserAlreadyExists(msg)
+
+        logger.info("User successfully created: ID - {}", new_user.id)
+        return new_user
+
     @classmethod
     async def get_user_by_user_id(cls, user_id: UUID, session: AsyncSession) -> UserInDB:
         existing_user = await try_find_user(session=session, user_id=user_id)
         return existing_user
 
+    @classmethod
+    async def get_user_public(cls, user_id: UUID, session: AsyncSession) -> UserOut:
+        """Публичные поля пользователя сразу в UserOut, без ORM объекта"""
+        user = await UserDAO.find_one_projection(session, schema=UserOut, id=user_id)
+        if user is None:
+            msg = f"User with id - {user_id} not found"
+            logger.warning(msg)
+            raise UserNotFound(msg)
+        return user
+
+    @classmethod
+    async def get_user_principal(cls, user_id: UUID, session: AsyncSession) -> UserPrincipal:
+        user = await UserDAO.find_one_projection(session, schema=UserPrincipal, id=user_id)
+        if user is None:
+            msg = f"User with id - {user_id} not found"
+            logger.warning(msg)
+            raise UserNotFound(msg)
+        return user
+
     @classmethod
     async def get_user_by_email(cls, email: str, session: AsyncSession) -> UserInDB:
         existing_user = await UserDAO.find_one_or_none(session=session, email=email)
         if existing_user is None:
             msg = f"User with email - {email} not found"
-            logger.error(msg)
+            logger.warning(msg)
             raise UserNotFound(msg)
         return existing_user
 
     @classmethod
     async def update_user(cls, user_id: UUID, user: UserUpdate, session: AsyncSession) -> UserInDB:
-        await try_find_user(session=session, user_id=user_id)
-
         update_data = user.model_dump(exclude_unset=True)
 
         if "password" in update_data:
-            update_data["hashed_password"] = auth_utils.hash_password(update_data.pop("password"))
+            update_data["hashed_password"] = await auth_utils.hash_password_async(update_data.pop("password"))
 
         try:
             new_user = await UserDAO.update(
@@ -69,42 +88,51 @@ class UserService:
                 UserDAO.model.id == user_id,
                 obj_in=update_data
             )
-            await session.commit()
-
-            logger.info(f"User successfully updated: ID - {new_user.id}")
-
-            return new_user
         except Exception as e:
-            await session.rollback()
             msg = f"Error updating user (id - {user_id}): {e}"
             logger.error(msg)
             raise UserCannotUpdate(msg)
 
+        # Существование пользователя проверяет сам UPDATE ... RETURNING, без отдельного SELECT
+        if new_user is None:
+            msg = f"User with id - {user_id} not found"
+            logger.warning(msg)
+            raise UserNotFound(msg)
+
+        logger.info("User successfully updated: ID - {}", new_user.id)
+        return new_user
+
     @classmethod
     async def delete_user(cls, user_id: UUID, session: AsyncSession) -> None:
-        await try_find_user(session=session, user_id=user_id)
         try:
-            await UserDAO.delete(session=session, id=user_id)
-            await session.commit()
-
-            logger.info(f"User successfully deleted")
+            # Профиль удалился бы и каскадом, но явное удаление сбрасывает его кэш после коммита
+            await BusinessProfileDAO.delete_many(session, user_id=user_id)
+            deleted = await UserDAO.delete_returning(session=session, id=user_id)
         except Exception as e:
-            await session.rollback()
             msg = f"Error deleting user (id - {user_id}): {e}"
             logger.error(msg)
             raise UserCannotDelete(msg)
 
+        # Если пользователя нет, удаление профиля откатит unit of work
+        if not deleted:
+            msg = f"User with id - {user_id} not found"
+            logger.warning(msg)
+            raise UserNotFound(msg)
+
+        logger.info("User successfully deleted: ID - {}", user_id)
+
     @classmethod
-    async def authenticate_user(cls, email: str, password: str, session: AsyncSession) -> UserInDB:
-        user = await UserDAO.find_one_or_none(session=session, email=email)
+    async def authenticate_user(cls, email: str, password: str, session: AsyncSession) -> UserCredentials:
+        # Хэш пароля читается из БД: в кэше другого воркера он может быть еще старым после смены пароля
+        user = await UserDAO.find_one_projection(session, schema=UserCredentials, use_cache=False, email=email)
         if user is None:
             msg = f"User with email - {email} does not exist"
-            logger.error(msg)
+            logger.warning(msg)
             raise UserNotFound(msg)
 
-        if not auth_utils.verify_password(password, user.hashed_password):
+        if not await auth_utils.verify_password_async(password, user.hashed_password):
             msg = f"Incorrect username or password"
-            logger.error(msg)
+            logger.warning(msg)
             raise InvalidPasswordOrUsername(msg)
 
         return user
@@ -114,7 +142,7 @@ class UserService:
         user_business_profile = await BusinessProfileDAO.find_one_or_none(session=session, user_id=user_id)
         if user_business_profile is None:
             msg = f"User with id - {user_id} has not business profile"
-            logger.error(msg)
+            logger.warning(msg)
             raise UserHasNotBusinessProfile(msg)
 
         return user_business_profile
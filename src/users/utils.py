@@ -12,6 +12,6 @@ async def try_find_user(session: AsyncSession, user_id: uuid.UUID) -> UserInDB:
     existing_user = await UserDAO.find_one_or_none(session=session, id=user_id)
     if existing_user is None:
         msg = f"User with id - {user_id} not found"
-        logger.error(msg)
+        logger.warning(msg)
         raise UserNotFound(msg)
     return existing_user
@@ -1,3 +1,5 @@
+from contextlib import contextmanager
+
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
@@ -5,12 +7,22 @@ from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.pool import StaticPool
 
+from src.auth.token_cache import verified_token_cache
 from src.core.config import settings
 from src.database import session as database_session_module
-from src.database.session import Base
+from src.database.cache import clear_entity_caches
+from src.database.query_stats import instrument_query_stats, track_queries
+from src.database.session import Base, unit_of_work
 from src.main import app
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_caches():
+    yield
+    clear_entity_caches()
+    verified_token_cache.clear()
+
+
 @pytest_asyncio.fixture(scope="function")
 async def test_engine():
     engine = create_async_engine(
@@ -39,18 +51,42 @@ async def session(test_engine):
 @pytest_asyncio.fixture(scope="function")
 def override_get_db(session):
     async def _override_get_db():
-        yield session
+        async with unit_of_work(session):
+            yield session
 
     return _override_get_db
 
 
 @pytest_asyncio.fixture(scope="function")
-async def app_with_db(override_get_db):
+def override_get_read_db(session):
+    async def _override_get_read_db():
+        yield session
+
+    return _override_get_read_db
+
+
+@pytest_asyncio.fixture(scope="function")
+async def app_with_db(override_get_db, override_get_read_db):
     app.dependency_overrides[database_session_module.get_session] = override_get_db  # type: ignore
+    app.dependency_overrides[database_session_module.get_read_session] = override_get_read_db  # type: ignore
     yield app
     app.dependency_overrides.clear()  # type: ignore
 
 
+@pytest.fixture(scope="function")
+def max_queries(test_engine):
+    """Не больше limit запросов к БД внутри блока: with max_queries(2): await client.get(...)"""
+    instrument_query_stats(test_engine)
+
+    @contextmanager
+    def _max_queries(limit: int):
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= limit, f"Expected at most {limit} queries, got {stats.report()}"
+
+    return _max_queries
+
+
 @pytest_asyncio.fixture(scope="function")
 async def client(app_with_db):
     async with AsyncClient(
@@ -1,4 +1,10 @@
 import pytest
+from sqlalchemy import event
+
+from src.auth import utils as auth_utils
+from src.core.config import settings
+from src.database.session import unit_of_work_stats
+from src.users.dao import UserDAO
 
 
 async def register_and_login(client, user_data):
@@ -32,6 +38,19 @@ async def test_register_user_already_exist(client, user1_test_data):
     assert second.json()["error"]["message"] == "User already exists"
 
 
+@pytest.mark.asyncio
+async def test_register_duplicate_skips_password_hashing(client, user1_test_data, monkeypatch):
+    assert (await client.post("/auth/register", json=user1_test_data)).status_code == 201
+    UserDAO.get_cache().clear()
+
+    async def fail_hash(password):
+        raise AssertionError("bcrypt must not run for an existing email")
+
+    monkeypatch.setattr(auth_utils, "hash_password_async", fail_hash)
+    result = await client.post("/auth/register", json=user1_test_data)
+    assert result.status_code == 409
+
+
 @pytest.mark.asyncio
 async def test_register_user_with_bad_data(client, user3_bad_test_data):
     result = await client.post("/auth/register", json=user3_bad_test_data)
@@ -56,6 +75,27 @@ async def test_login_user(client, user1_test_data):
     assert "access_token" in result.json()
 
 
+@pytest.mark.asyncio
+async def test_login_commits_once(client, user1_test_data):
+    await client.post("/auth/register", json=user1_test_data)
+    before = unit_of_work_stats.stats()
+
+    result = await client.post(
+        "/auth/login",
+        data={
+            "username": user1_test_data["email"],
+            "password": user1_test_data["password"]
+        },
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    after = unit_of_work_stats.stats()
+
+    assert result.status_code == 200
+    assert after["requests"] - before["requests"] == 1
+    assert after["commits"] - before["commits"] == 1
+    assert after["rollbacks"] == before["rollbacks"]
+
+
 @pytest.mark.asyncio
 async def test_login_user_with_bad_password(client, user1_test_data):
     await client.post("/auth/register", json=user1_test_data)
@@ -118,9 +158,80 @@ async def test_refresh_token(client, user1_test_data):
     assert "access_token" in result.json()
 
 
+@pytest.mark.asyncio
+async def test_refresh_token_uses_single_query(client, test_engine, user1_test_data):
+    await register_and_login(client, user1_test_data)
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        result = await client.post("/auth/refresh")
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", count_statement)
+
+    assert result.status_code == 200
+    assert len(statements) == 1
+
+
 # Logout
 @pytest.mark.asyncio
 async def test_logout(client, user1_test_data):
     await register_and_login(client, user1_test_data)
+    refresh_token = client.cookies.get("refresh_token", domain="test.local")
+
+    result = await client.post("/auth/logout")
+    assert result.status_code == 200
+    assert result.json() == {"revoked": True}
+
+    client.cookies.clear()
+    client.cookies.set("refresh_token", refresh_token)
+    result = await client.post("/auth/logout")
+    assert result.status_code == 200
+    assert result.json() == {"revoked": False}
+
+
+@pytest.mark.asyncio
+async def test_refresh_after_logout_with_memory_revocation(client, user1_test_data, monkeypatch):
+    monkeypatch.setattr(settings.auth, "REFRESH_REVOCATION_MODE", "memory")
+    await register_and_login(client, user1_test_data)
+    refresh_token = client.cookies.get("refresh_token", domain="test.local")
+    assert refresh_token is not None
+
+    assert (await client.post("/auth/refresh")).status_code == 200
+
+    await client.post("/auth/logout")
+    client.cookies.clear()
+    client.cookies.set("refresh_token", refresh_token)
+    result = await client.post("/auth/refresh")
+    assert result.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_warm_refresh_with_memory_revocation_skips_database(client, user1_test_data, monkeypatch, max_queries):
+    monkeypatch.setattr(settings.auth, "REFRESH_REVOCATION_MODE", "memory")
+    await register_and_login(client, user1_test_data)
+    assert (await client.post("/auth/refresh")).status_code == 200
+
+    with max_queries(0):
+        result = await client.post("/auth/refresh")
+    assert result.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_repeated_logout_with_memory_revocation(client, user1_test_data, monkeypatch):
+    monkeypatch.setattr(settings.auth, "REFRESH_REVOCATION_MODE", "memory")
+    await register_and_login(client, user1_test_data)
+    refresh_token = client.cookies.get("refresh_token", domain="test.local")
+
+    result = await client.post("/auth/logout")
+    assert result.status_code == 200
+    assert result.json() == {"revoked": True}
+
+    client.cookies.clear()
+    client.cookies.set("refresh_token", refresh_token)
     result = await client.post("/auth/logout")
-    assert result.status_code == 204
+    assert result.status_code == 200
+    assert result.json() == {"revoked": False}
@@ -0,0 +1,39 @@
+import uuid
+
+import pytest
+
+
+async def login(client, user_data):
+    await client.post("/auth/register", json=user_data)
+    result = await client.post(
+        "/auth/login",
+        data={"username": user_data["email"], "password": user_data["password"]},
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    return {"Authorization": f"Bearer {result.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_business_profile_writes_are_scoped_to_owner(client, user2_test_data):
+    owner = await login(client, user2_test_data)
+    stranger = await login(client, {**user2_test_data, "email": "stranger@gmail.com", "phone": "+77777777777"})
+
+    created = await client.post(
+        "/business-profile",
+        json={"business_name": "Shop", "user_id": str(uuid.uuid4())},
+        headers=owner
+    )
+    assert created.status_code == 201
+    business_id = created.json()["id"]
+
+    assert (await client.get(f"/business-profile/{business_id}", headers=stranger)).status_code == 403
+    update = await client.put(f"/business-profile/{business_id}", json={"business_name": "Mine"}, headers=stranger)
+    assert update.status_code == 403
+    assert (await client.delete(f"/business-profile/{business_id}", headers=stranger)).status_code == 403
+
+    update = await client.put(f"/business-profile/{business_id}", json={"business_name": "New"}, headers=owner)
+    assert update.status_code == 200
+    assert update.json()["business_name"] == "New"
+
+    assert (await client.delete(f"/business-profile/{business_id}", headers=owner)).status_code == 204
+    assert (await client.delete(f"/business-profile/{business_id}", headers=owner)).status_code == 404
@@ -0,0 +1,40 @@
+import pytest
+
+from src.core.config import settings
+from src.monitoring.metrics import http_requests_total
+
+ROUTE = "/api/business-profile/{business_id}"
+
+
+@pytest.mark.asyncio
+async def test_metrics_use_route_template(client, get_access_token):
+    headers = {"Authorization": f"Bearer {get_access_token}"}
+    before = http_requests_total.value("GET", ROUTE, "403")
+
+    for _ in range(2):
+        await client.get("/business-profile/00000000-0000-0000-0000-000000000000", headers=headers)
+    await client.get("/no-such-route")
+
+    result = await client.get("http://test/metrics")
+    assert result.status_code == 200
+    assert result.headers["content-type"].startswith("text/plain")
+    assert http_requests_total.value("GET", ROUTE, "403") - before == 2
+    assert 'route="<unmatched>"' in result.text
+    assert "00000000-0000-0000-0000-000000000000" not in result.text
+    assert 'auth_password_hash_seconds_count{operation="hash"}' in result.text
+    assert 'auth_jwt_seconds_count{operation="sign"}' in result.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path",
+    ["/monitoring/caches", "/monitoring/sweeper", "/monitoring/pool", "/monitoring/transactions", "/monitoring/logging"],
+)
+async def test_monitoring_stats_require_profiling_token(client, monkeypatch, path):
+    assert (await client.get(path)).status_code == 404
+
+    monkeypatch.setattr(settings.monitoring, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(settings.monitoring, "PROFILING_TOKEN", "secret")
+    assert (await client.get(path)).status_code == 403
+    result = await client.get(path, headers={settings.monitoring.PROFILING_HEADER: "secret"})
+    assert result.status_code == 200
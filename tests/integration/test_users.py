@@ -0,0 +1,48 @@
+import pytest
+
+from src.core.config import settings
+
+
+@pytest.mark.asyncio
+async def test_read_current_user(client, get_access_token, user1_test_data):
+    result = await client.get("/users/me", headers={"Authorization": f"Bearer {get_access_token}"})
+    assert result.status_code == 200
+    assert result.json()["email"] == user1_test_data["email"]
+
+
+@pytest.mark.asyncio
+async def test_read_current_user_with_refresh_token(client, get_access_token):
+    refresh_token = client.cookies.get("refresh_token")
+    result = await client.get("/users/me", headers={"Authorization": f"Bearer {refresh_token}"})
+    assert result.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_business_route_forbidden_for_user_role_in_stateless_mode(client, get_access_token, monkeypatch):
+    monkeypatch.setattr(settings.auth, "STATELESS_PRINCIPAL", True)
+    result = await client.post(
+        "/business-profile",
+        json={"business_name": "Shop"},
+        headers={"Authorization": f"Bearer {get_access_token}"}
+    )
+    assert result.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_current_user_query_budget(client, get_access_token, max_queries, monkeypatch):
+    monkeypatch.setattr(settings.db, "ENTITY_CACHE_ENABLED", False)
+    headers = {"Authorization": f"Bearer {get_access_token}"}
+
+    with max_queries(1):
+        result = await client.get("/users/me", headers=headers)
+    assert result.status_code == 200
+
+    # principal + UPDATE ... RETURNING
+    with max_queries(2):
+        result = await client.put("/users/me", json={"first_name": "Oleg"}, headers=headers)
+    assert result.status_code == 200
+
+    # principal + удаление профиля + DELETE ... RETURNING
+    with max_queries(3):
+        result = await client.delete("/users/me", headers=headers)
+    assert result.status_code == 204
@@ -0,0 +1,134 @@
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from src.cache.backends import MemoryCacheBackend, RedisCacheBackend
+from src.cache.invalidation import InvalidationBus
+from src.database.cache import EntityCache
+
+
+class FakeRedisServer:
+    """Минимальный сервер с протоколом Redis для тестов: GET/SET/MGET/DEL/PUBLISH/SUBSCRIBE"""
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = {}
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+
+    @staticmethod
+    async def _read_command(reader):
+        header = await reader.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    @staticmethod
+    def _bulk(value):
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    async def _handle(self, reader, writer):
+        while (command := await self._read_command(reader)) is not None:
+            name, args = command[0].upper(), command[1:]
+            if name == b"SET":
+                self.data[args[0]] = args[1]
+                writer.write(b"+OK\r\n")
+            elif name == b"MGET":
+                writer.write(b"*%d\r\n" % len(args) + b"".join(self._bulk(self.data.get(key)) for key in args))
+            elif name == b"DEL":
+                writer.write(b":%d\r\n" % sum(self.data.pop(key, None) is not None for key in args))
+            elif name == b"PUBLISH":
+                receivers = self.subscribers.get(args[0], set())
+                for subscriber in receivers:
+                    subscriber.write(b"*3\r\n" + self._bulk(b"message") + self._bulk(args[0]) + self._bulk(args[1]))
+                writer.write(b":%d\r\n" % len(receivers))
+            elif name == b"SUBSCRIBE":
+                self.subscribers.setdefault(args[0], set()).add(writer)
+                writer.write(b"*3\r\n" + self._bulk(b"subscribe") + self._bulk(args[0]) + b":1\r\n")
+            else:
+                writer.write(b"-ERR unknown command\r\n")
+            await writer.drain()
+        for subscribers in self.subscribers.values():
+            subscribers.discard(writer)
+
+
+@pytest_asyncio.fixture
+async def redis_url():
+    server = FakeRedisServer()
+    port = await server.start()
+    yield f"redis://127.0.0.1:{port}/0"
+    await server.stop()
+
+
+@pytest_asyncio.fixture(params=["memory", "redis"])
+async def backend(request, redis_url):
+    if request.param == "memory":
+        backend = MemoryCacheBackend(key_prefix="test:")
+    else:
+        backend = RedisCacheBackend(redis_url, key_prefix="test:")
+    yield backend
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_backend_get_set_delete(backend):
+    await backend.set_many({"a": b"1", "b": b"2"}, ttl=60)
+
+    assert await backend.get_many(["a", "b", "c"]) == [b"1", b"2", None]
+    assert await backend.delete("a", "c") == 1
+    assert await backend.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_backend_publish_subscribe(backend):
+    received = asyncio.Queue()
+
+    async def listen():
+        async for message in backend.subscribe("channel"):
+            await received.put(message)
+
+    listener = asyncio.create_task(listen())
+    await asyncio.sleep(0.05)
+    await backend.publish("channel", b"hello")
+
+    assert await asyncio.wait_for(received.get(), timeout=1) == b"hello"
+    listener.cancel()
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_delivered_to_other_workers(redis_url):
+    worker_a = InvalidationBus(RedisCacheBackend(redis_url), channel="invalidate")
+    worker_b = InvalidationBus(RedisCacheBackend(redis_url), channel="invalidate")
+    cache_a = EntityCache("users", "id", ("id", "email"), 60, 100, {"id": uuid.UUID, "email": str}, worker_a)
+    cache_b = EntityCache("users", "id", ("id", "email"), 60, 100, {"id": uuid.UUID, "email": str}, worker_b)
+    await worker_b.start()
+    await asyncio.sleep(0.05)
+
+    snapshot = {"id": uuid.uuid4(), "email": "cache@gmail.com"}
+    await cache_a.store(snapshot)
+    assert await cache_b.fetch("email", "cache@gmail.com") == snapshot
+
+    cache_a.invalidate(snapshot["id"])
+    cache_a.broadcast("id", snapshot["id"])
+    for _ in range(20):
+        await asyncio.sleep(0.05)
+        if cache_b.get("id", snapshot["id"]) is None:
+            break
+
+    assert cache_b.get("id", snapshot["id"]) is None
+    assert await cache_b.fetch("email", "cache@gmail.com") is None
+
+    await worker_a.stop()
+    await worker_b.stop()
@@ -0,0 +1,165 @@
+import uuid
+
+import pytest
+
+from src.database.base import ScopeResult
+from src.exceptions.exception_dao import InvalidCursorError
+from src.users.dao import UserDAO
+from src.users.schemas import UserCredentials, UserRole
+
+
+@pytest.fixture
+def user_data():
+    return {
+        "email": "dao@gmail.com",
+        "hashed_password": "hash",
+        "role": "user",
+        "first_name": "Ivan",
+        "last_name": "Ivanov",
+        "phone": "+79999999999",
+    }
+
+
+@pytest.mark.asyncio
+async def test_insert_or_ignore_skips_duplicates(session, user_data):
+    user = await UserDAO.insert_or_ignore(session=session, obj_in=user_data)
+    duplicate = await UserDAO.insert_or_ignore(session=session, obj_in={**user_data, "phone": "+71111111111"})
+    await session.commit()
+
+    assert user is not None and user.email == user_data["email"]
+    assert duplicate is None
+    assert len(await UserDAO.find_all(session=session)) == 1
+
+
+@pytest.mark.asyncio
+async def test_scoped_update_and_delete_tell_not_found_from_forbidden(session, user_data):
+    user = await UserDAO.add(session=session, obj_in=user_data)
+    await session.commit()
+    other_id, missing_id = uuid.uuid4(), uuid.uuid4()
+
+    result, obj = await UserDAO.update_scoped(
+        session, {"first_name": "Oleg"}, scope={"email": "x@gmail.com"}, id=user.id
+    )
+    assert (result, obj) == (ScopeResult.FORBIDDEN, None)
+
+    result, obj = await UserDAO.update_scoped(
+        session, {"first_name": "Oleg"}, scope={"email": user.email}, id=user.id
+    )
+    assert result == ScopeResult.OK and obj.first_name == "Oleg"
+
+    result, _ = await UserDAO.delete_scoped(session, scope={"id": other_id}, email=user.email)
+    assert result == ScopeResult.FORBIDDEN
+    result, _ = await UserDAO.delete_scoped(session, scope={"email": user.email}, id=missing_id)
+    assert result == ScopeResult.NOT_FOUND
+    result, deleted = await UserDAO.delete_scoped(session, scope={"email": user.email}, id=user.id)
+    assert result == ScopeResult.OK and len(deleted) == 1
+
+
+@pytest.mark.asyncio
+async def test_scoped_operations_with_column_in_filter_and_scope(session, user_data):
+    user = await UserDAO.add(session=session, obj_in=user_data)
+    await session.commit()
+
+    result, _ = await UserDAO.update_scoped(
+        session, {"first_name": "Oleg"}, scope={"email": "x@gmail.com"}, email=user.email
+    )
+    assert result == ScopeResult.FORBIDDEN
+    result, obj = await UserDAO.update_scoped(
+        session, {"first_name": "Oleg"}, scope={"email": user.email}, email=user.email
+    )
+    assert result == ScopeResult.OK and obj.first_name == "Oleg"
+
+    result, _ = await UserDAO.delete_scoped(session, scope={"email": user.email}, email="missing@gmail.com")
+    assert result == ScopeResult.NOT_FOUND
+    result, deleted = await UserDAO.delete_scoped(session, scope={"email": user.email}, email=user.email)
+    assert result == ScopeResult.OK and len(deleted) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_operations(session, user_data):
+    users = [{**user_data, "email": f"bulk{i}@gmail.com"} for i in range(5)]
+    assert await UserDAO.add_many(session, users, chunk_size=2) == 5
+
+    users[0]["first_name"] = "Oleg"
+    assert await UserDAO.upsert_many(session, users[:2], conflict_columns=("email",)) == 2
+    assert (await UserDAO.find_one_or_none(session=session, email="bulk0@gmail.com")).first_name == "Oleg"
+    # Без колонок для обновления дубликаты пропускаются и не попадают в счетчик
+    assert await UserDAO.upsert_many(
+        session, [users[0], {**user_data, "email": "bulk5@gmail.com"}], conflict_columns=("email",), update_columns=()
+    ) == 1
+    with pytest.raises(ValueError):
+        await UserDAO.upsert_many(session, [users[0], {"email": "bulk0@gmail.com"}], conflict_columns=("email",))
+
+    updated = await UserDAO.update_many(
+        session,
+        UserDAO.model.email.in_(["bulk1@gmail.com", "bulk2@gmail.com"]),
+        obj_in={"last_name": "Petrov"}
+    )
+    assert updated == 2
+    assert await UserDAO.delete_many(session, UserDAO.model.last_name == "Petrov") == 2
+    await session.commit()
+    assert len(await UserDAO.find_all(session=session)) == 4
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination_and_stream(session, user_data):
+    await UserDAO.add_many(session, [{**user_data, "email": f"page{i}@gmail.com"} for i in range(5)])
+    await session.commit()
+
+    emails, cursor = [], None
+    while True:
+        page = await UserDAO.find_page(session, order_by=("email",), limit=2, cursor=cursor)
+        emails.extend(user.email for user in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert emails == [f"page{i}@gmail.com" for i in range(5)]
+    descending = await UserDAO.find_page(session, order_by=("email",), descending=True, limit=2)
+    assert [user.email for user in descending.items] == ["page4@gmail.com", "page3@gmail.com"]
+    assert [user.email async for user in UserDAO.stream(session, order_by=("email",), chunk_size=2)] == emails
+
+    with pytest.raises(InvalidCursorError):
+        await UserDAO.find_page(session, order_by=("email",), cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_projection_reads(session, user_data):
+    user = await UserDAO.add(session=session, obj_in=user_data)
+    await session.commit()
+
+    row = await UserDAO.find_one_projection(session, columns=("id", "role"), first_name="Ivan")
+    assert row == {"id": user.id, "role": UserRole.USER}
+
+    cache = UserDAO.get_cache()
+    hits = cache.hits
+    for _ in range(2):
+        principal = await UserDAO.find_one_projection(session, columns=("id", "role"), email=user.email)
+        assert principal == {"id": user.id, "role": UserRole.USER}
+    assert cache.hits - hits == 1
+
+    # hashed_password исключен из кэша: учетные данные всегда читаются из БД
+    hits = cache.hits
+    for _ in range(2):
+        credentials = await UserDAO.find_one_projection(session, schema=UserCredentials, email=user.email)
+        assert credentials == UserCredentials(id=user.id, hashed_password="hash", role=UserRole.USER)
+    assert cache.hits == hits
+
+    credentials = await UserDAO.find_one_projection(session, columns=("id",), use_cache=False, email=user.email)
+    assert credentials == {"id": user.id} and cache.hits == hits
+
+    assert await UserDAO.find_all_projection(session, columns=("email",)) == [{"email": user.email}]
+    assert await UserDAO.find_one_projection(session, schema=UserCredentials, email="missing@gmail.com") is None
+
+
+@pytest.mark.asyncio
+async def test_single_column_lookups_reuse_prebuilt_statements(session, user_data):
+    user = await UserDAO.add(session=session, obj_in=user_data)
+    await session.commit()
+
+    first, params = UserDAO._lookup_query((), {"email": "a@gmail.com"})
+    second, _ = UserDAO._lookup_query((), {"email": "b@gmail.com"})
+    assert first is second and params == {"lookup_email": "a@gmail.com"}
+
+    assert (await UserDAO.find_one_or_none(session=session, email=user.email)).id == user.id
+    assert await UserDAO.find_one_or_none(session=session, phone=None) is None
@@ -0,0 +1,57 @@
+import pytest
+
+from src.database.cache import entity_caches
+from src.users.dao import UserDAO
+from src.users.schemas import UserOut
+
+
+@pytest.fixture
+def user_data():
+    return {
+        "email": "cache@gmail.com",
+        "hashed_password": "hash",
+        "role": "user",
+        "first_name": "Ivan",
+        "last_name": "Ivanov",
+        "phone": "+79999999999",
+    }
+
+
+@pytest.mark.asyncio
+async def test_find_one_or_none_fills_cache_without_excluded_columns(session, user_data):
+    user = await UserDAO.add(session=session, obj_in=user_data)
+    await session.commit()
+
+    cache = UserDAO.get_cache()
+    hits, misses = cache.hits, cache.misses
+
+    await UserDAO.find_one_or_none(session=session, id=user.id)
+    snapshot = await UserDAO.find_cached(email=user_data["email"])
+    public = await UserDAO.find_one_projection(session, schema=UserOut, email=user_data["email"])
+    # Хэша пароля в кэше нет, поэтому полный объект читается из БД
+    full = await UserDAO.find_one_or_none(session=session, email=user_data["email"])
+
+    assert snapshot["id"] == user.id and "hashed_password" not in snapshot
+    assert public.id == user.id
+    assert full.hashed_password == "hash"
+    assert cache.hits - hits == 2
+    assert cache.misses == misses
+    assert "users" in entity_caches
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_invalidate_cache(session, user_data):
+    user = await UserDAO.add(session=session, obj_in=user_data)
+    await session.commit()
+    await UserDAO.find_one_or_none(session=session, id=user.id)
+
+    await UserDAO.update(session, UserDAO.model.id == user.id, obj_in={"email": "new@gmail.com"})
+    await session.commit()
+
+    assert (await UserDAO.find_one_or_none(session=session, email=user_data["email"])) is None
+    assert (await UserDAO.find_one_or_none(session=session, id=user.id)).email == "new@gmail.com"
+
+    await UserDAO.delete(session=session, id=user.id)
+    await session.commit()
+
+    assert (await UserDAO.find_one_or_none(session=session, id=user.id)) is None
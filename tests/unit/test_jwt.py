@@ -0,0 +1,87 @@
+import os
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from src.auth import utils as auth_utils
+from src.auth.keys import KeyManager
+from src.auth.schemas import TokenTypes
+
+
+def write_key_pair(private_path, public_path):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_path.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    public_path.write_bytes(private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ))
+
+
+@pytest.fixture
+def key_paths(tmp_path):
+    private_path, public_path = tmp_path / "jwt-private.pem", tmp_path / "jwt-public.pem"
+    write_key_pair(private_path, public_path)
+    return private_path, public_path
+
+
+def test_fast_path_is_compatible_with_pyjwt(key_paths):
+    manager = KeyManager(*key_paths, algorithm="RS256")
+    payload = {"type": TokenTypes.ACCESS_TOKEN_TYPE.value, "sub": "user-id", "role": "user",
+               "exp": int(time.time()) + 60}
+
+    fast_token = manager.signer.encode(payload)
+    assert jwt.decode(fast_token, manager.public_key, algorithms=["RS256"]) == payload
+
+    pyjwt_token = jwt.encode(payload, manager.private_key, algorithm="RS256")
+    assert manager.verifier.decode(pyjwt_token) == payload
+
+
+def test_fast_decode_rejects_bad_tokens(key_paths):
+    manager = KeyManager(*key_paths, algorithm="RS256")
+    claims = {"type": TokenTypes.ACCESS_TOKEN_TYPE.value, "sub": "user-id"}
+
+    expired = manager.signer.encode({**claims, "exp": int(time.time()) - 1})
+    with pytest.raises(jwt.ExpiredSignatureError):
+        manager.verifier.decode(expired)
+
+    header, payload, signature = manager.signer.encode({**claims, "exp": int(time.time()) + 60}).split(".")
+    forged = manager.signer.encode({**claims, "sub": "other-user", "exp": int(time.time()) + 60})
+    with pytest.raises(jwt.InvalidSignatureError):
+        manager.verifier.decode(".".join([header, forged.split(".")[1], signature]))
+
+    unsigned = jwt.encode({**claims, "exp": int(time.time()) + 60}, None, algorithm="none")
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        manager.verifier.decode(unsigned)
+
+    with pytest.raises(jwt.MissingRequiredClaimError):
+        manager.verifier.decode(manager.signer.encode({"sub": "user-id", "exp": int(time.time()) + 60}))
+
+
+def test_key_manager_reloads_changed_keys(key_paths):
+    manager = KeyManager(*key_paths, algorithm="RS256", reload_check_seconds=0)
+    old_signer = manager.signer
+    assert manager.signer is old_signer
+
+    write_key_pair(*key_paths)
+    for path in key_paths:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert manager.signer is not old_signer
+    token = manager.signer.encode({"type": "access", "sub": "user-id", "exp": int(time.time()) + 60})
+    assert manager.verifier.decode(token)["sub"] == "user-id"
+
+
+def test_encode_decode_jwt_round_trip():
+    token = auth_utils.encode_jwt({"type": TokenTypes.REFRESH_TOKEN_TYPE, "sub": "user-id"}, jti="token-id")
+    payload = auth_utils.decode_jwt(token)
+
+    assert payload["type"] == "refresh"
+    assert payload["jti"] == "token-id"
@@ -0,0 +1,26 @@
+from loguru import logger
+
+from src.core.logging import LogThrottle
+
+
+def test_log_throttle_limits_and_samples_per_call_site():
+    throttle = LogThrottle(rate_limit=2, window_seconds=60, sample_every=3)
+    messages = []
+    handler_id = logger.add(messages.append, filter=throttle, format="{message} {extra}")
+    try:
+        for i in range(8):
+            logger.warning("User with id - {} not found", i)
+        logger.warning("Another call site")
+    finally:
+        logger.remove(handler_id)
+
+    # 0, 1 по лимиту, затем каждая третья сверх лимита: 4 и 7
+    assert [m.record["message"] for m in messages] == [
+        "User with id - 0 not found",
+        "User with id - 1 not found",
+        "User with id - 4 not found",
+        "User with id - 7 not found",
+        "Another call site",
+    ]
+    assert messages[2].record["extra"]["suppressed"] == 2
+    assert throttle.stats()["suppressed"] == 4
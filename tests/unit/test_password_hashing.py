@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+import pytest
+
+from src.auth import utils as auth_utils
+from src.core.config import settings
+from src.exceptions.exception_auth import PasswordHashingUnavailable
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_password_async():
+    hashed = await auth_utils.hash_password_async("Test1Password123")
+
+    assert await auth_utils.verify_password_async("Test1Password123", hashed)
+    assert not await auth_utils.verify_password_async("WrongPassword123", hashed)
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_rejects_when_queue_is_full(monkeypatch):
+    monkeypatch.setattr(settings.auth, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(settings.auth, "PASSWORD_HASH_QUEUE_SIZE", 0)
+
+    results = await asyncio.gather(
+        auth_utils.hash_password_async("Test1Password123"),
+        auth_utils.hash_password_async("Test1Password123"),
+        return_exceptions=True,
+    )
+
+    assert any(isinstance(result, PasswordHashingUnavailable) for result in results)
+    assert any(isinstance(result, str) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_timed_out_job_keeps_its_slot_until_it_finishes(monkeypatch):
+    monkeypatch.setattr(settings.auth, "PASSWORD_HASH_TIMEOUT_SECONDS", 0.01)
+
+    with pytest.raises(PasswordHashingUnavailable):
+        await auth_utils._run_in_password_executor("hash", time.sleep, 0.2)
+    assert auth_utils._password_jobs_in_flight == 1
+
+    await asyncio.sleep(0.3)
+    assert auth_utils._password_jobs_in_flight == 0
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.config import DBSettings
+from src.database.pool import InstrumentedPool, engine_options, get_pool_stats, warm_up_pool
+
+
+def test_pgbouncer_mode_disables_prepared_statement_caches():
+    db_settings = DBSettings(
+        POSTGRES_HOST="localhost", POSTGRES_USER="u", POSTGRES_PASSWORD="p", POSTGRES_DB="d", PGBOUNCER_MODE=True
+    )
+    connect_args = engine_options(db_settings)["connect_args"]
+
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
+
+
+def test_empty_replica_host_means_no_replica():
+    db_settings = DBSettings(
+        POSTGRES_HOST="localhost", POSTGRES_USER="u", POSTGRES_PASSWORD="p", POSTGRES_DB="d", REPLICA_HOST=""
+    )
+    assert db_settings.replica_url is None
+
+
+@pytest.mark.asyncio
+async def test_pool_warm_up_and_stats():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=InstrumentedPool,
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    assert await warm_up_pool(engine, 5) == 2
+    assert get_pool_stats(engine)["checked_in"] == 2
+
+    first, second = await engine.connect(), await engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        await engine.connect()
+    stats = get_pool_stats(engine)
+    assert stats["checked_out"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["wait_seconds_max"] >= 0.05
+
+    await first.close()
+    await second.close()
+    await engine.dispose()
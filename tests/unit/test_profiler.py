@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from src.core.config import MonitoringSettings
+from src.monitoring.profiler import ProfileStore, ProfilingMiddleware
+
+
+def busy_handler_work():
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def app(scope, receive, send):
+    busy_handler_work()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def call(middleware, headers):
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "POST", "path": "/api/auth/login", "headers": headers}
+    await middleware(scope, None, send)
+
+
+@pytest.mark.asyncio
+async def test_profiling_middleware_writes_folded_stacks_to_ring_buffer(tmp_path):
+    store = ProfileStore(directory=tmp_path, max_files=2)
+    middleware = ProfilingMiddleware(
+        app,
+        MonitoringSettings(PROFILING_ENABLED=True, PROFILING_TOKEN="secret"),
+        store,
+    )
+
+    await call(middleware, [(b"x-profile-token", b"wrong")])
+    await call(middleware, [])
+    assert store.list() == []
+
+    for _ in range(3):
+        await call(middleware, [(b"x-profile-token", b"secret")])
+
+    profiles = store.list()
+    assert len(profiles) == 2
+    assert "POST_api_auth_login" in profiles[0]["name"]
+
+    folded = store.get(profiles[0]["name"]).read_text()
+    stack, count = folded.splitlines()[0].rsplit(" ", 1)
+    assert "busy_handler_work" in stack.split(";")[-1]
+    assert int(count) > 0
+
+    assert store.get("../secret.folded") is None
@@ -0,0 +1,47 @@
+import uuid
+
+import pytest
+from loguru import logger
+
+from src.core.config import DBSettings
+from src.database.query_stats import QueryStatsMiddleware, instrument_query_stats, track_queries
+from src.users.dao import UserDAO
+
+
+@pytest.mark.asyncio
+async def test_track_queries_sees_statements_from_sqlalchemy_greenlet(session, test_engine):
+    # Обработчики событий движка выполняются внутри greenlet SQLAlchemy; контекст у него тот же
+    instrument_query_stats(test_engine)
+
+    with track_queries() as outer:
+        with track_queries() as inner:
+            for _ in range(3):
+                await UserDAO.find_one_or_none(session=session, email=f"{uuid.uuid4().hex}@gmail.com")
+        await UserDAO.find_one_or_none(session=session, id=uuid.uuid4())
+
+    assert inner.count == 3
+    assert outer.count == 4
+    assert len(inner.repeated(threshold=3)) == 1
+
+
+@pytest.mark.asyncio
+async def test_middleware_logs_repeated_statements(session, test_engine):
+    instrument_query_stats(test_engine)
+    state = {}
+
+    async def app(scope, receive, send):
+        state.update(scope["state"])
+        for _ in range(3):
+            await UserDAO.find_one_or_none(session=session, id=uuid.uuid4())
+
+    messages = []
+    handler_id = logger.add(messages.append, level="WARNING", format="{message}")
+    try:
+        middleware = QueryStatsMiddleware(app, DBSettings(QUERY_BUDGET_PER_REQUEST=10, QUERY_REPEAT_THRESHOLD=3))
+        await middleware({"type": "http", "method": "GET", "path": "/api/users/me"}, None, None)
+    finally:
+        logger.remove(handler_id)
+
+    assert state["query_stats"].count == 3
+    assert len(messages) == 1
+    assert "3 queries (budget 10), 1 repeated statements" in messages[0]
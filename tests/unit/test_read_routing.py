@@ -0,0 +1,105 @@
+import time
+
+import pytest
+from fastapi import Response
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+from src.database.session import (
+    Base,
+    READ_PRIMARY_COOKIE,
+    SESSION_BYPASS_CACHE_KEY,
+    SESSION_REPLICA_KEY,
+    SESSION_RESPONSE_KEY,
+    get_read_session,
+    reads_from_primary,
+)
+from src.users.dao import UserDAO
+from src.users.models import UserModel
+from src.users.schemas import UserOut
+
+USER_DATA = {
+    "email": "replica@gmail.com",
+    "hashed_password": "hash",
+    "role": "user",
+    "first_name": "Ivan",
+    "last_name": "Ivanov",
+    "phone": "+79999999999",
+}
+
+
+def make_request(cookie: str | None) -> Request:
+    headers = [(b"cookie", f"{READ_PRIMARY_COOKIE}={cookie}".encode())] if cookie is not None else []
+    return Request({"type": "http", "headers": headers})
+
+
+@pytest.mark.asyncio
+async def test_write_marks_client_to_read_from_primary(session):
+    response = Response()
+    session.info[SESSION_RESPONSE_KEY] = response
+
+    await UserDAO.find_one_or_none(session=session, email="nobody@gmail.com")
+    assert READ_PRIMARY_COOKIE not in response.headers.get("set-cookie", "")
+
+    await UserDAO.delete_many(session, email="nobody@gmail.com")
+    assert READ_PRIMARY_COOKIE in response.headers["set-cookie"]
+
+
+def test_reads_from_primary_until_cookie_expires():
+    assert reads_from_primary(make_request(str(int(time.time()) + 5)))
+    assert not reads_from_primary(make_request(str(int(time.time()) - 5)))
+    assert not reads_from_primary(make_request("garbage"))
+    assert not reads_from_primary(make_request(None))
+
+
+@pytest.mark.asyncio
+async def test_read_session_from_primary_bypasses_cache():
+    sessions = get_read_session(make_request(str(int(time.time()) + 5)))
+    session = await sessions.__anext__()
+    assert session.info.get(SESSION_BYPASS_CACHE_KEY)
+    await sessions.aclose()
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_does_not_refill_cache(session):
+    user = await UserDAO.add(session=session, obj_in=USER_DATA)
+    await session.commit()
+
+    # Реплика еще не получила новое имя
+    replica_engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    try:
+        async with replica_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(replica_engine) as replica:
+            replica.add(UserModel(id=user.id, **USER_DATA))
+            await replica.commit()
+
+            await UserDAO.update(session, UserDAO.model.id == user.id, obj_in={"first_name": "Oleg"})
+            await session.commit()
+
+            replica.info[SESSION_REPLICA_KEY] = True
+            stale = await UserDAO.find_one_projection(replica, schema=UserOut, id=user.id)
+            assert stale.first_name == "Ivan"
+            assert await UserDAO.find_cached(id=user.id) is None
+
+        fresh = await UserDAO.find_one_projection(session, schema=UserOut, id=user.id)
+        assert fresh.first_name == "Oleg"
+    finally:
+        await replica_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_session_skips_cache(session):
+    user = await UserDAO.add(session=session, obj_in=USER_DATA)
+    await session.commit()
+    await UserDAO.find_one_projection(session, schema=UserOut, id=user.id)
+
+    # Запись мимо DAO: кэш об изменении не знает
+    await session.execute(update(UserModel).where(UserModel.id == user.id).values(first_name="Oleg"))
+    await session.commit()
+    assert (await UserDAO.find_one_projection(session, schema=UserOut, id=user.id)).first_name == "Ivan"
+
+    session.info[SESSION_BYPASS_CACHE_KEY] = True
+    assert (await UserDAO.find_one_projection(session, schema=UserOut, id=user.id)).first_name == "Oleg"
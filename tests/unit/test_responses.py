@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime, timezone
+
+import orjson
+from fastapi import responses
+
+from src.core.responses import ORJSONResponse
+from src.users.schemas import UserOut, UserRole
+
+
+def test_orjson_response_serializes_uuid_datetime_and_models():
+    user_id = uuid.uuid4()
+    created_at = datetime(2025, 1, 1, 12, 30, tzinfo=timezone.utc)
+    user = UserOut(
+        id=user_id,
+        email="test@gmail.com",
+        role=UserRole.USER,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+
+    response = ORJSONResponse({"id": user_id, "created_at": created_at, "user": user})
+    body = orjson.loads(response.body)
+
+    assert isinstance(response, responses.ORJSONResponse)
+    assert response.media_type == "application/json"
+    assert body["id"] == str(user_id)
+    assert body["created_at"] == "2025-01-01T12:30:00+00:00"
+    assert body["user"]["role"] == "user"
+    assert body["user"]["id"] == str(user_id)
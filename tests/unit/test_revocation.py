@@ -0,0 +1,42 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from src.auth.dao import RevokedTokenDAO
+from src.auth.revocation import RevocationList
+from src.core.config import AuthSettings, CacheSettings, Settings
+
+
+def test_revocation_list_forgets_expired_tokens():
+    revocation_list = RevocationList()
+    active, expired = uuid.uuid4(), uuid.uuid4()
+    revocation_list.add(active, time.time() + 60)
+    revocation_list.add(expired, time.time() - 1)
+
+    assert revocation_list.is_revoked(str(active))
+    assert not revocation_list.is_revoked(expired)
+    assert not revocation_list.is_revoked(uuid.uuid4())
+
+
+@pytest.mark.asyncio
+async def test_revocation_list_loads_active_tokens_from_db(session):
+    now = datetime.now(timezone.utc)
+    active, expired = uuid.uuid4(), uuid.uuid4()
+    await RevokedTokenDAO.add(session=session, obj_in={"jti": active, "expires_at": now + timedelta(days=1)})
+    await RevokedTokenDAO.add(session=session, obj_in={"jti": expired, "expires_at": now - timedelta(days=1)})
+    await session.commit()
+
+    revocation_list = RevocationList()
+    assert await revocation_list.load(session) == 1
+    assert revocation_list.is_revoked(active)
+    assert not revocation_list.is_revoked(expired)
+
+
+def test_memory_revocation_requires_shared_cache_backend():
+    with pytest.raises(ValidationError):
+        Settings(auth=AuthSettings(REFRESH_REVOCATION_MODE="memory"), cache=CacheSettings(CACHE_BACKEND="memory"))
+
+    Settings(auth=AuthSettings(REFRESH_REVOCATION_MODE="memory"), cache=CacheSettings(CACHE_BACKEND="redis"))
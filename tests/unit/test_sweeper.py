@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.auth.dao import RefreshTokenDAO, RevokedTokenDAO
+from src.auth.sweeper import ExpiredTokenSweeper
+
+
+@pytest.mark.asyncio
+async def test_sweeper_deletes_only_expired_tokens_in_batches(test_engine, session):
+    now = datetime.now(timezone.utc)
+    user_id = uuid.uuid4()
+    active = uuid.uuid4()
+    for jti, expires_at in [(active, now + timedelta(days=1))] + [
+        (uuid.uuid4(), now - timedelta(days=1)) for _ in range(5)
+    ]:
+        await RefreshTokenDAO.add(
+            session=session,
+            obj_in={"jti": jti, "token_hash": b"0" * 32, "expires_at": expires_at, "user_id": user_id},
+        )
+    await RevokedTokenDAO.add(session=session, obj_in={"jti": uuid.uuid4(), "expires_at": now - timedelta(days=1)})
+    await session.commit()
+
+    sweeper = ExpiredTokenSweeper(batch_size=2, pause_seconds=0)
+
+    assert await sweeper.sweep(test_engine) == {"refresh_tokens": 5, "revoked_tokens": 1}
+    assert await RefreshTokenDAO.find_one_or_none(session=session, jti=active) is not None
+    assert await sweeper.sweep(test_engine) == {"refresh_tokens": 0, "revoked_tokens": 0}
+    assert sweeper.stats()["deleted"] == {"refresh_tokens": 5, "revoked_tokens": 1}
@@ -0,0 +1,38 @@
+import time
+
+from src.auth.token_cache import VerifiedTokenCache
+
+
+def test_cache_hit_and_miss_counters():
+    cache = VerifiedTokenCache(max_size=10)
+    claims = {"sub": "user-id", "exp": int(time.time()) + 60}
+
+    assert cache.get("token") is None
+    cache.put("token", claims)
+
+    assert cache.get("token") == claims
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_drops_expired_tokens():
+    cache = VerifiedTokenCache(max_size=10)
+    cache.put("token", {"sub": "user-id", "exp": int(time.time()) - 1})
+
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_evicts_least_recently_used_and_clears():
+    cache = VerifiedTokenCache(max_size=2)
+    exp = int(time.time()) + 60
+    cache.put("first", {"sub": "1", "exp": exp})
+    cache.put("second", {"sub": "2", "exp": exp})
+    cache.get("first")
+    cache.put("third", {"sub": "3", "exp": exp})
+
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+
+    cache.clear()
+    assert cache.stats()["size"] == 0